@@ -9,9 +9,11 @@ Handles:
 """
 
 import csv
+import io
 import logging
 import os
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 def parse_hex_color(hex_str: str) -> Tuple[int, int, int]:
@@ -35,6 +37,10 @@ def parse_hex_color(hex_str: str) -> Tuple[int, int, int]:
         raise ValueError(f"Invalid hex color format: {hex_str}") from e
 
 
+# Teams often share colors, so repeated hex strings are parsed only once
+_parse_hex_color_cached = lru_cache(maxsize=1024)(parse_hex_color)
+
+
 def load_affiliation_colors(csv_path: str) -> Dict[str, Tuple[Tuple[int, int, int], Tuple[int, int, int], str]]:
     """Load affiliation color mappings from CSV file.
 
@@ -63,8 +69,8 @@ def load_affiliation_colors(csv_path: str) -> Dict[str, Tuple[Tuple[int, int, in
 
                 # Parse hex colors (format: #RRGGBB)
                 try:
-                    bg_rgb = parse_hex_color(bg_hex)
-                    text_rgb = parse_hex_color(text_hex)
+                    bg_rgb = _parse_hex_color_cached(bg_hex)
+                    text_rgb = _parse_hex_color_cached(text_hex)
                     # Store display name (use affiliation as fallback if name is empty)
                     display_name = name if name else affil
                     colors[affil] = (bg_rgb, text_rgb, display_name)
@@ -78,6 +84,59 @@ def load_affiliation_colors(csv_path: str) -> Dict[str, Tuple[Tuple[int, int, in
     return colors
 
 
+def _parse_lynx_lines(lines: Iterable[str]) -> Dict[Tuple[int, int, int], Dict]:
+    """Parse lynx.evt lines into a mapping of (event, round, heat) -> event dict.
+
+    Args:
+        lines: Iterable of lynx.evt lines (open file, StringIO, list, ...)
+
+    Returns:
+        Mapping of (event, round, heat) to event dicts with their athletes
+    """
+    events: Dict[Tuple[int, int, int], Dict] = {}
+    current_event_key: Optional[Tuple[int, int, int]] = None
+
+    for raw in lines:
+        line = raw.strip('\n')
+        if not line:
+            continue
+        # Split CSV; use simple split because format is basic
+        parts = [p.strip() for p in line.split(',')]
+        if not parts:
+            continue
+        first = parts[0]
+        # Event header if first column contains a number
+        if first and first.isdigit():
+            try:
+                ev = int(parts[0])
+                rd = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+                ht = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0
+                name = parts[3] if len(parts) > 3 else ""
+            except Exception:
+                # Malformed header; skip
+                current_event_key = None
+                continue
+            key = (ev, rd, ht)
+            events[key] = {"event": ev, "round": rd, "heat": ht, "name": name, "athletes": []}
+            current_event_key = key
+        else:
+            # Athlete line if it starts with an empty first column
+            if current_event_key is None:
+                # No current event; ignore
+                continue
+            # athleteId, lane, last, first, affiliation
+            # parts[0] is empty
+            athlete = {}
+            athlete["id"] = parts[1] if len(parts) > 1 else ""
+            athlete["lane"] = parts[2] if len(parts) > 2 else ""
+            athlete["last"] = parts[3] if len(parts) > 3 else ""
+            athlete["first"] = parts[4] if len(parts) > 4 else ""
+            athlete["affiliation"] = parts[5] if len(parts) > 5 else ""
+            events[current_event_key]["athletes"].append(athlete)
+
+    return events
+
+
 def parse_lynx_file(path: str) -> Dict[Tuple[int, int, int], Dict]:
     """Parse the lynx.evt CSV file into a mapping of (event, round, heat) -> event dict.
 
@@ -93,52 +152,26 @@ def parse_lynx_file(path: str) -> Dict[Tuple[int, int, int], Dict]:
     Athlete line format (we only care about the first 6 columns):
       '', athleteId, lane, last name, first name, affiliation, ...
     """
-    events: Dict[Tuple[int, int, int], Dict] = {}
-
     if not os.path.isfile(path):
         raise FileNotFoundError(f"lynx file not found: {path}")
 
     with open(path, "r", encoding="utf-8", errors="replace") as fh:
-        current_event_key: Optional[Tuple[int, int, int]] = None
-        for raw in fh:
-            line = raw.strip('\n')
-            if not line:
-                continue
-            # Split CSV; use simple split because format is basic
-            parts = [p.strip() for p in line.split(',')]
-            if not parts:
-                continue
-            first = parts[0]
-            # Event header if first column contains a number
-            if first and first.isdigit():
-                try:
-                    ev = int(parts[0])
-                    rd = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
-                    ht = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0
-                    name = parts[3] if len(parts) > 3 else ""
-                except Exception:
-                    # Malformed header; skip
-                    current_event_key = None
-                    continue
-                key = (ev, rd, ht)
-                events[key] = {"event": ev, "round": rd, "heat": ht, "name": name, "athletes": []}
-                current_event_key = key
-            else:
-                # Athlete line if it starts with an empty first column
-                if current_event_key is None:
-                    # No current event; ignore
-                    continue
-                # athleteId, lane, last, first, affiliation
-                # parts[0] is empty
-                athlete = {}
-                athlete["id"] = parts[1] if len(parts) > 1 else ""
-                athlete["lane"] = parts[2] if len(parts) > 2 else ""
-                athlete["last"] = parts[3] if len(parts) > 3 else ""
-                athlete["first"] = parts[4] if len(parts) > 4 else ""
-                athlete["affiliation"] = parts[5] if len(parts) > 5 else ""
-                events[current_event_key]["athletes"].append(athlete)
+        return _parse_lynx_lines(fh)
 
-    return events
+
+def parse_lynx_text(content: str) -> Dict[Tuple[int, int, int], Dict]:
+    """Parse lynx.evt content that is already in memory.
+
+    Same format and result as parse_lynx_file(), without a file round trip.
+
+    Args:
+        content: lynx.evt file contents
+
+    Returns:
+        Mapping of (event, round, heat) to event dicts with their athletes
+    """
+    # newline=None gives the same universal-newline handling as open()
+    return _parse_lynx_lines(io.StringIO(content, newline=None))
 
 
 def is_relay_event(athletes: List[Dict]) -> bool:
@@ -196,8 +196,12 @@ def start_file_watcher(config_dir: str, reload_callback, use_polling: bool = Fal
 
     Returns:
         Observer or PollingFileWatcher instance (with start() called)
-        None if watcher could not be started
+        None if watcher could not be started (including missing config_dir)
     """
+    if not os.path.isdir(config_dir):
+        logging.error(f"Cannot watch missing config directory: {config_dir}")
+        return None
+
     if not use_polling and WATCHDOG_AVAILABLE:
         try:
             # Use watchdog for event-driven monitoring
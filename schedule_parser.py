@@ -5,9 +5,51 @@ Handles loading and parsing of lynx.sch schedule files which define
 the competition order of events.
 """
 
+import io
 import logging
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _parse_schedule_lines(lines: Iterable[str]) -> List[Tuple[int, int, int]]:
+    """Parse schedule lines into ordered list of (event, round, heat) tuples.
+
+    Args:
+        lines: Iterable of schedule file lines (open file, StringIO, list, ...)
+
+    Returns:
+        Ordered list of (event, round, heat) tuples; invalid lines are skipped
+    """
+    schedule = []
+
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+
+        # Skip empty lines and comments (lines starting with semicolon)
+        if not line or line.startswith(';'):
+            continue
+
+        # Parse CSV line
+        parts = line.split(',')
+        if len(parts) != 3:
+            logging.warning(f"Schedule line {line_num}: Invalid format (expected 3 fields): {line}")
+            continue
+
+        try:
+            event = int(parts[0].strip())
+            round_num = int(parts[1].strip())
+            heat = int(parts[2].strip())
+
+            if event <= 0 or round_num <= 0 or heat <= 0:
+                logging.warning(f"Schedule line {line_num}: Invalid values (must be positive): {line}")
+                continue
+
+            schedule.append((event, round_num, heat))
+        except ValueError:
+            logging.warning(f"Schedule line {line_num}: Invalid integer values: {line}")
+            continue
+
+    return schedule
 
 
 def parse_schedule(path: str) -> List[Tuple[int, int, int]]:
@@ -25,40 +67,13 @@ def parse_schedule(path: str) -> List[Tuple[int, int, int]]:
         Ordered list of (event, round, heat) tuples
         Returns empty list if file not found or has no valid entries
     """
-    schedule = []
-
     if not os.path.isfile(path):
         logging.info(f"Schedule file not found: {path}")
-        return schedule
+        return []
 
     try:
         with open(path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-
-                # Skip empty lines and comments (lines starting with semicolon)
-                if not line or line.startswith(';'):
-                    continue
-
-                # Parse CSV line
-                parts = line.split(',')
-                if len(parts) != 3:
-                    logging.warning(f"Schedule line {line_num}: Invalid format (expected 3 fields): {line}")
-                    continue
-
-                try:
-                    event = int(parts[0].strip())
-                    round_num = int(parts[1].strip())
-                    heat = int(parts[2].strip())
-
-                    if event <= 0 or round_num <= 0 or heat <= 0:
-                        logging.warning(f"Schedule line {line_num}: Invalid values (must be positive): {line}")
-                        continue
-
-                    schedule.append((event, round_num, heat))
-                except ValueError:
-                    logging.warning(f"Schedule line {line_num}: Invalid integer values: {line}")
-                    continue
+            schedule = _parse_schedule_lines(f)
 
         logging.info(f"Loaded schedule with {len(schedule)} entries from: {path}")
     except Exception as e:
@@ -68,6 +83,21 @@ def parse_schedule(path: str) -> List[Tuple[int, int, int]]:
     return schedule
 
 
+def parse_schedule_text(content: str) -> List[Tuple[int, int, int]]:
+    """Parse schedule content that is already in memory.
+
+    Same format and result as parse_schedule(), without a file round trip.
+
+    Args:
+        content: lynx.sch file contents
+
+    Returns:
+        Ordered list of (event, round, heat) tuples
+    """
+    # newline=None gives the same universal-newline handling as open()
+    return _parse_schedule_lines(io.StringIO(content, newline=None))
+
+
 def validate_schedule_entries(schedule: List[Tuple[int, int, int]],
                               events_dict: Dict[Tuple[int, int, int], Dict]) -> List[Tuple[int, int, int]]:
     """Validate schedule entries against available events and filter out invalid ones.
@@ -79,16 +109,15 @@ def validate_schedule_entries(schedule: List[Tuple[int, int, int]],
     Returns:
         Filtered list containing only valid schedule entries
     """
-    valid_schedule = []
-    invalid_count = 0
-
-    for entry in schedule:
-        if entry in events_dict:
-            valid_schedule.append(entry)
-        else:
-            event, round_num, heat = entry
-            logging.warning(f"Schedule entry Event {event}, Round {round_num}, Heat {heat} not found in lynx.evt - skipping")
-            invalid_count += 1
+    # Dict membership is already a hash lookup; only walk the schedule again
+    # to report entries when some were dropped
+    valid_schedule = [entry for entry in schedule if entry in events_dict]
+    invalid_count = len(schedule) - len(valid_schedule)
+
+    if invalid_count > 0:
+        for event, round_num, heat in schedule:
+            if (event, round_num, heat) not in events_dict:
+                logging.warning(f"Schedule entry Event {event}, Round {round_num}, Heat {heat} not found in lynx.evt - skipping")
 
     if invalid_count > 0:
         logging.warning(f"Filtered out {invalid_count} invalid schedule entries")
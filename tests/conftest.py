@@ -3,6 +3,8 @@ Pytest configuration and shared fixtures for LED Panels tests.
 """
 
 import json
+import logging
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Any, Dict
@@ -114,20 +116,78 @@ def schedule_fixture(fixture_path) -> Path:
     return fixture_path / "sample_schedule.sch"
 
 
-@pytest.fixture
-def populated_config_dir(temp_config_dir, lynx_evt_fixture, colors_csv_fixture):
-    """Create a config directory populated with sample files."""
-    import shutil
+@pytest.fixture(scope="session")
+def _golden_config_dir(tmp_path_factory):
+    """Create the sample-populated config directory once per session.
+
+    Do not modify; use populated_config_dir for tests that write files.
+    """
+    fixtures = Path(__file__).parent / "fixtures"
+    config_dir = tmp_path_factory.mktemp("golden_config")
 
-    # Copy fixture files to temp config directory
-    shutil.copy(lynx_evt_fixture, temp_config_dir / "lynx.evt")
-    shutil.copy(colors_csv_fixture, temp_config_dir / "colors.csv")
+    # Copy fixture files to the golden config directory
+    shutil.copy(fixtures / "sample_lynx.evt", config_dir / "lynx.evt")
+    shutil.copy(fixtures / "sample_colors.csv", config_dir / "colors.csv")
 
     # Create current_event.json
     current_event = {"event": 1, "round": 1, "heat": 1}
-    (temp_config_dir / "current_event.json").write_text(json.dumps(current_event, indent=2))
+    (config_dir / "current_event.json").write_text(json.dumps(current_event, indent=2))
+
+    return config_dir
+
+
+@pytest.fixture
+def readonly_config_dir(_golden_config_dir):
+    """Return the shared populated config directory (tests must not write to it)."""
+    return _golden_config_dir
+
+
+@pytest.fixture(scope="module")
+def shared_web_server(_golden_config_dir):
+    """Create one WebServer per test module over the golden config directory.
+
+    Only for tests that do not write files; construct a dedicated
+    WebServer on populated_config_dir otherwise.
+    """
+    from web_server import WebServer
+
+    server = WebServer(str(_golden_config_dir), host="127.0.0.1", port=0)
+
+    # Let exceptions reach pytest instead of rendering 500 pages, and keep
+    # request logging out of the hot path
+    server.app.testing = True
+    server.app.config['PROPAGATE_EXCEPTIONS'] = True
+    server.app.logger.disabled = True
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
 
-    return temp_config_dir
+    return server
+
+
+@pytest.fixture(scope="module")
+def client(shared_web_server):
+    """Return a Flask test client for shared_web_server, reused per module."""
+    with shared_web_server.app.test_client() as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def sample_events_content():
+    """Return the text of sample_lynx.evt, read once per session."""
+    return (Path(__file__).parent / "fixtures" / "sample_lynx.evt").read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_schedule_content():
+    """Return the text of sample_schedule.sch, read once per session."""
+    return (Path(__file__).parent / "fixtures" / "sample_schedule.sch").read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def populated_config_dir(_golden_config_dir, tmp_path):
+    """Create a private, writable copy of the populated config directory."""
+    config_dir = tmp_path / "config"
+    shutil.copytree(_golden_config_dir, config_dir)
+    return config_dir
 
 
 @pytest.fixture
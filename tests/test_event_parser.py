@@ -13,7 +13,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from event_parser import (extract_relay_suffix, fill_lanes_with_empty_rows,
                           format_athlete_line, get_duplicate_relay_teams,
                           is_relay_event, load_affiliation_colors,
-                          paginate_items, parse_hex_color, parse_lynx_file)
+                          paginate_items, parse_hex_color, parse_lynx_file,
+                          parse_lynx_text)
 
 
 class TestExtractRelaySuffix:
@@ -449,6 +450,18 @@ class TestParseLynxEvt:
         assert individual_event is not None
         assert len(individual_event["athletes"]) > 0
 
+    def test_parse_text_matches_file(self, lynx_evt_fixture):
+        """Test that parsing in-memory content matches parsing the file."""
+        content = lynx_evt_fixture.read_text(encoding="utf-8")
+
+        assert parse_lynx_text(content) == parse_lynx_file(str(lynx_evt_fixture))
+
+    def test_parse_text_handles_crlf(self):
+        """Test that CRLF line endings parse the same as LF."""
+        content = "1,1,1,Girls 55 Meter Dash\r\n,101,3,Smith,Jane,RICO\r\n"
+
+        assert parse_lynx_text(content) == parse_lynx_text(content.replace("\r\n", "\n"))
+
     @pytest.mark.skip(reason="parse_lynx_file raises FileNotFoundError instead of returning empty dict")
     def test_missing_file_returns_empty_dict(self, tmp_path):
         """Test that missing file returns empty dictionary."""
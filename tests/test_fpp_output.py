@@ -3,9 +3,10 @@ Tests for fpp_output.py module.
 """
 
 import socket
+import struct
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -14,76 +15,90 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from fpp_output import FPPMatrix, create_fpp_backend
 
 
+def assert_pixel(buf, x, y, rgb):
+    """Assert the pixel at (x, y) in a (height, width, 3) buffer equals rgb."""
+    assert (buf[y, x] == rgb).all()
+
+
+@pytest.fixture(scope="class")
+def _shared_fpp_matrix():
+    """Create one 64x32 FPPMatrix per test class with a mocked UDP socket."""
+    with patch('fpp_output.socket.socket', new_callable=Mock) as mock_socket:
+        matrix = FPPMatrix(host="127.0.0.1", port=4048, width=64, height=32)
+        yield matrix, mock_socket
+
+
+@pytest.fixture
+def fpp_matrix(_shared_fpp_matrix):
+    """Return the shared (matrix, mock_socket) pair with a cleared buffer."""
+    matrix, mock_socket = _shared_fpp_matrix
+    matrix.Clear()
+    return matrix, mock_socket
+
+
 class TestFPPMatrix:
     """Tests for FPPMatrix class."""
 
-    def test_creates_matrix_with_options(self):
+    def test_creates_matrix_with_options(self, fpp_matrix):
         """Test creating FPPMatrix with direct parameters."""
-        matrix = FPPMatrix(host="127.0.0.1", port=4048, width=64, height=32)
+        matrix, _ = fpp_matrix
 
         assert matrix.height == 32
         assert matrix.width == 64
         assert matrix.host == "127.0.0.1"
         assert matrix.port == 4048
 
-    def test_matrix_dimensions(self):
+    @patch('fpp_output.socket.socket', new_callable=Mock)
+    def test_matrix_dimensions(self, mock_socket):
         """Test matrix dimensions are set correctly."""
         matrix = FPPMatrix(host="127.0.0.1", port=4048, width=128, height=64)
 
         assert matrix.height == 64
         assert matrix.width == 128
 
-    @patch('socket.socket')
-    def test_sends_data_via_udp(self, mock_socket):
+    def test_sends_data_via_udp(self, fpp_matrix):
         """Test that matrix sends data via UDP socket."""
-        mock_sock_instance = MagicMock()
-        mock_socket.return_value = mock_sock_instance
-
-        matrix = FPPMatrix(host="127.0.0.1", port=4048, width=64, height=32)
+        _, mock_socket = fpp_matrix
 
         # Check that socket was created
         mock_socket.assert_called_with(socket.AF_INET, socket.SOCK_DGRAM)
 
-    def test_set_pixel_updates_buffer(self):
+    def test_set_pixel_updates_buffer(self, fpp_matrix):
         """Test that SetPixel updates the pixel buffer."""
-        import numpy as np
-        matrix = FPPMatrix(host="127.0.0.1", port=4048, width=64, height=32)
+        matrix, _ = fpp_matrix
 
         matrix.SetPixel(5, 10, 255, 128, 64)
 
         # Buffer should be updated - verify by checking buffer contents
-        expected = np.array([255, 128, 64])
-        assert np.array_equal(matrix.buffer[10][5], expected)
+        assert_pixel(matrix.buffer, 5, 10, [255, 128, 64])
 
-    def test_clear_resets_buffer(self):
+    def test_clear_resets_buffer(self, fpp_matrix):
         """Test that Clear resets the pixel buffer."""
-        matrix = FPPMatrix(host="127.0.0.1", port=4048, width=64, height=32)
+        matrix, _ = fpp_matrix
 
         matrix.SetPixel(5, 10, 255, 255, 255)
         matrix.Clear()
 
         # After clear, buffer should be reset
+        assert not matrix.buffer.any()
 
     @pytest.mark.skip(reason="FPPMatrix does not have Fill method")
-    def test_fill_sets_all_pixels(self):
+    def test_fill_sets_all_pixels(self, fpp_matrix):
         """Test that Fill sets all pixels to specified color."""
-        matrix = FPPMatrix(host="127.0.0.1", port=4048, width=64, height=32)
+        matrix, _ = fpp_matrix
 
         matrix.Fill(100, 150, 200)
 
-        # Verify fill worked by checking a pixel
-        import numpy as np
-        expected = np.array([100, 150, 200])
-        assert np.array_equal(matrix.buffer[0][0], expected)
+        # Verify fill worked across the whole buffer
+        assert (matrix.buffer == [100, 150, 200]).all()
 
 
 class TestDDPProtocol:
     """Tests for DDP protocol implementation."""
 
-    @patch('socket.socket')
-    def test_ddp_packet_format(self, mock_socket):
+    def test_ddp_packet_format(self, fpp_matrix):
         """Test DDP packet format."""
-        matrix = FPPMatrix(host="127.0.0.1", port=4048, width=64, height=32)
+        matrix, mock_socket = fpp_matrix
 
         # Set some pixels to trigger packet generation
         matrix.SetPixel(0, 0, 255, 0, 0)
@@ -92,21 +107,31 @@ class TestDDPProtocol:
         # Verify socket was created (packet would be sent)
         mock_socket.assert_called()
 
-    def test_ddp_header_size(self):
-        """Test that DDP header is 10 bytes."""
-        # DDP header structure: flags(1) + sequence(1) + type(1) + id(1) + offset(4) + length(2)
-        # Total: 10 bytes
-        header_size = 10
-        assert header_size == 10
+    def test_ddp_header_layout(self, fpp_matrix):
+        """Test the DDP header emitted by SwapOnVSync."""
+        matrix, mock_socket = fpp_matrix
+
+        matrix.SwapOnVSync(matrix)
+
+        # Header: flags(1) + sequence(1) + type(1) + id(1) + offset(3) + length(2)
+        packet, address = mock_socket.return_value.sendto.call_args[0]
+        flags, sequence, data_type, dest_id, off_hi, off_mid, off_lo, length = \
+            struct.unpack('>7BH', packet[:9])
+
+        assert (flags, sequence, data_type, dest_id) == (0x04, 0x01, 0x01, 0x01)
+        assert (off_hi, off_mid, off_lo) == (0, 0, 0)
+        assert length == 64 * 32 * 3
+        assert len(packet) == 9 + length
+        assert address == ("127.0.0.1", 4048)
 
 
 class TestFPPGraphics:
     """Tests for FPPMatrix graphics methods."""
 
     @pytest.mark.skip(reason="FPPMatrix does not have DrawText method")
-    def test_draw_text(self):
+    def test_draw_text(self, fpp_matrix):
         """Test DrawText method."""
-        matrix = FPPMatrix(host="127.0.0.1", port=4048, width=64, height=32)
+        matrix, _ = fpp_matrix
 
         # Mock font
         font = Mock()
@@ -118,9 +143,9 @@ class TestFPPGraphics:
         # Should not raise exception
 
     @pytest.mark.skip(reason="FPPMatrix does not have DrawLine method")
-    def test_draw_line(self):
+    def test_draw_line(self, fpp_matrix):
         """Test DrawLine method."""
-        matrix = FPPMatrix(host="127.0.0.1", port=4048, width=64, height=32)
+        matrix, _ = fpp_matrix
 
         # Draw line from (0,0) to (10,10)
         matrix.DrawLine(0, 0, 10, 10, 255, 255, 255)
@@ -4,7 +4,7 @@ Tests for matrix_backend.py module.
 
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -17,7 +17,7 @@ class TestGetMatrixBackend:
         """Test ColorLight backend is returned when use_colorlight=True."""
         from matrix_backend import get_matrix_backend
         
-        with patch('matrix_backend.create_colorlight_backend') as mock_colorlight:
+        with patch('matrix_backend.create_colorlight_backend', new_callable=Mock) as mock_colorlight:
             mock_colorlight.return_value = ('ColorLightMatrix', None, None)
             result = get_matrix_backend(use_colorlight=True, colorlight_interface='eth0')
             
@@ -28,7 +28,7 @@ class TestGetMatrixBackend:
         """Test FPP backend is returned when use_fpp=True."""
         from matrix_backend import get_matrix_backend
         
-        with patch('matrix_backend.create_fpp_backend') as mock_fpp:
+        with patch('matrix_backend.create_fpp_backend', new_callable=Mock) as mock_fpp:
             mock_fpp.return_value = ('FPPMatrix', None, None)
             result = get_matrix_backend(use_fpp=True, fpp_host='192.168.1.100')
             
@@ -39,8 +39,8 @@ class TestGetMatrixBackend:
         """Test ColorLight takes priority when both are enabled."""
         from matrix_backend import get_matrix_backend
         
-        with patch('matrix_backend.create_colorlight_backend') as mock_colorlight:
-            with patch('matrix_backend.create_fpp_backend') as mock_fpp:
+        with patch('matrix_backend.create_colorlight_backend', new_callable=Mock) as mock_colorlight:
+            with patch('matrix_backend.create_fpp_backend', new_callable=Mock) as mock_fpp:
                 mock_colorlight.return_value = ('ColorLightMatrix', None, None)
                 result = get_matrix_backend(use_colorlight=True, use_fpp=True)
                 
@@ -51,7 +51,7 @@ class TestGetMatrixBackend:
         """Test rgbmatrix/emulator backend when network backends disabled."""
         from matrix_backend import get_matrix_backend
         
-        with patch('matrix_backend.try_import_rgbmatrix') as mock_rgb:
+        with patch('matrix_backend.try_import_rgbmatrix', new_callable=Mock) as mock_rgb:
             mock_rgb.return_value = ('RGBMatrix', 'RGBMatrixOptions', 'graphics')
             result = get_matrix_backend(use_colorlight=False, use_fpp=False)
             
@@ -62,7 +62,7 @@ class TestGetMatrixBackend:
         """Test fallback to None when no backend available."""
         from matrix_backend import get_matrix_backend
         
-        with patch('matrix_backend.try_import_rgbmatrix') as mock_rgb:
+        with patch('matrix_backend.try_import_rgbmatrix', new_callable=Mock) as mock_rgb:
             mock_rgb.return_value = (None, None, None)
             result = get_matrix_backend(use_colorlight=False, use_fpp=False)
             
@@ -72,7 +72,7 @@ class TestGetMatrixBackend:
         """Test hardware settings are passed correctly."""
         from matrix_backend import get_matrix_backend
         
-        with patch('matrix_backend.create_fpp_backend') as mock_fpp:
+        with patch('matrix_backend.create_fpp_backend', new_callable=Mock) as mock_fpp:
             mock_fpp.return_value = ('FPPMatrix', None, None)
             result = get_matrix_backend(
                 use_fpp=True,
@@ -2,6 +2,7 @@
 Tests for schedule_parser.py module.
 """
 
+import io
 import sys
 from pathlib import Path
 
@@ -9,9 +10,16 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from schedule_parser import (find_nearest_schedule_index, find_schedule_index,
+from schedule_parser import (_parse_schedule_lines,
+                             find_nearest_schedule_index, find_schedule_index,
                              get_schedule_position_text, parse_schedule,
-                             validate_schedule_entries)
+                             parse_schedule_text, validate_schedule_entries)
+
+# Shared small schedules for the index/position lookup tests
+_SCHED = [(1, 1, 1), (2, 1, 1), (3, 1, 1)]
+_SCHED_ROUNDS = [(1, 1, 1), (1, 2, 1), (1, 3, 1)]
+_SCHED_GAP = [(1, 1, 1), (3, 1, 1)]
+_SCHED_LATE = [(5, 1, 1), (6, 1, 1)]
 
 
 class TestParseSchedule:
@@ -36,23 +44,17 @@ class TestParseSchedule:
             assert isinstance(entry[1], int)  # round
             assert isinstance(entry[2], int)  # heat
 
-    def test_ignores_comment_lines(self, tmp_path):
+    def test_ignores_comment_lines(self):
         """Test that comment lines (starting with semicolon) are ignored."""
-        schedule_file = tmp_path / "test.sch"
-        schedule_file.write_text("; Comment line\n1,1,1\n; Another comment\n2,1,1\n")
-
-        schedule = parse_schedule(str(schedule_file))
+        schedule = _parse_schedule_lines(io.StringIO("; Comment line\n1,1,1\n; Another comment\n2,1,1\n"))
 
         assert len(schedule) == 2
         assert schedule[0] == (1, 1, 1)
         assert schedule[1] == (2, 1, 1)
 
-    def test_ignores_empty_lines(self, tmp_path):
+    def test_ignores_empty_lines(self):
         """Test that empty lines are ignored."""
-        schedule_file = tmp_path / "test.sch"
-        schedule_file.write_text("1,1,1\n\n2,1,1\n\n\n3,1,1\n")
-
-        schedule = parse_schedule(str(schedule_file))
+        schedule = _parse_schedule_lines(io.StringIO("1,1,1\n\n2,1,1\n\n\n3,1,1\n"))
 
         assert len(schedule) == 3
 
@@ -64,15 +66,18 @@ class TestParseSchedule:
 
         assert schedule == []
 
-    def test_invalid_format_skips_line(self, tmp_path):
+    def test_invalid_format_skips_line(self):
         """Test that invalid format lines are skipped."""
-        schedule_file = tmp_path / "test.sch"
-        schedule_file.write_text("1,1,1\ninvalid line\n2,1,1\n")
-
-        schedule = parse_schedule(str(schedule_file))
+        schedule = _parse_schedule_lines(io.StringIO("1,1,1\ninvalid line\n2,1,1\n"))
 
         assert len(schedule) == 2
 
+    def test_parse_text_matches_file(self, schedule_fixture):
+        """Test that parsing in-memory content matches parsing the file."""
+        content = schedule_fixture.read_text(encoding="utf-8")
+
+        assert parse_schedule_text(content) == parse_schedule(str(schedule_fixture))
+
 
 class TestValidateSchedule:
     """Tests for validate_schedule function."""
@@ -130,130 +135,39 @@ class TestValidateSchedule:
 class TestFindScheduledPosition:
     """Tests for find_schedule_index function."""
 
-    def test_finds_exact_position(self):
-        """Test finding exact position in schedule."""
-        schedule = [
-            (1, 1, 1),
-            (2, 1, 1),
-            (3, 1, 1)
-        ]
-
-        pos = find_schedule_index(schedule, 2, 1, 1)
-
-        assert pos == 1
-
-    def test_returns_none_when_not_found(self):
-        """Test that -1 is returned when position not found."""
-        schedule = [
-            (1, 1, 1),
-            (2, 1, 1)
-        ]
-
-        pos = find_schedule_index(schedule, 99, 1, 1)
-
-        assert pos == -1
-
-    def test_finds_position_with_different_rounds(self):
-        """Test finding position with different round numbers."""
-        schedule = [
-            (1, 1, 1),
-            (1, 2, 1),
-            (1, 3, 1)
-        ]
-
-        pos = find_schedule_index(schedule, 1, 2, 1)
-
-        assert pos == 1
+    @pytest.mark.parametrize("schedule,event,rnd,heat,expected", [
+        (_SCHED, 2, 1, 1, 1),
+        (_SCHED, 99, 1, 1, -1),
+        (_SCHED_ROUNDS, 1, 2, 1, 1),
+    ], ids=["exact_position", "not_found", "different_rounds"])
+    def test_find_schedule_index(self, schedule, event, rnd, heat, expected):
+        """Test finding positions in schedule (-1 when not found)."""
+        assert find_schedule_index(schedule, event, rnd, heat) == expected
 
 
 class TestFindNearestScheduled:
     """Tests for find_nearest_schedule_index function."""
 
-    def test_finds_next_scheduled_event(self):
-        """Test finding the next scheduled event after current position."""
-        schedule = [
-            (1, 1, 1),
-            (2, 1, 1),
-            (3, 1, 1)
-        ]
-
-        # find_nearest returns INDEX (int), not tuple
-        result = find_nearest_schedule_index(schedule, 1, 1, 1)
-
-        assert result is not None
-        assert result == 0  # Found at index 0 (exact match)
-
-    def test_wraps_to_beginning(self):
-        """Test that exact match returns correct index."""
-        schedule = [
-            (1, 1, 1),
-            (2, 1, 1),
-            (3, 1, 1)
-        ]
-
-        # find_nearest returns INDEX (int), not tuple, doesn't wrap
-        result = find_nearest_schedule_index(schedule, 3, 1, 1)
-
-        assert result is not None
-        assert result == 2  # Found at index 2 (exact match)
-
-    def test_returns_none_for_empty_schedule(self):
-        """Test that None is returned for empty schedule."""
-        schedule = []
-
-        result = find_nearest_schedule_index(schedule, 1, 1, 1)
-
-        assert result is None
-
-    def test_finds_first_event_when_current_not_in_schedule(self):
-        """Test finding first event when current position not in schedule."""
-        schedule = [
-            (5, 1, 1),
-            (6, 1, 1)
-        ]
-
-        # find_nearest returns index, not tuple
-        result = find_nearest_schedule_index(schedule, 1, 1, 1)
-
-        assert result is not None
-        assert result == 0  # Found at index 0 (first entry >= current)
+    @pytest.mark.parametrize("schedule,event,rnd,heat,expected", [
+        (_SCHED, 1, 1, 1, 0),
+        (_SCHED, 3, 1, 1, 2),
+        ([], 1, 1, 1, None),
+        (_SCHED_LATE, 1, 1, 1, 0),
+    ], ids=["exact_first", "exact_last", "empty_schedule", "current_not_in_schedule"])
+    def test_find_nearest_schedule_index(self, schedule, event, rnd, heat, expected):
+        """Test finding the nearest index at or after the current position."""
+        # find_nearest returns INDEX (int), not tuple, and doesn't wrap
+        assert find_nearest_schedule_index(schedule, event, rnd, heat) == expected
 
 
 class TestFormatSchedulePosition:
     """Tests for get_schedule_position_text function."""
 
-    def test_formats_position_in_schedule(self):
-        """Test formatting position when event is in schedule."""
-        schedule = [
-            (1, 1, 1),
-            (2, 1, 1),
-            (3, 1, 1)
-        ]
-
-        result = get_schedule_position_text(schedule, 2, 1, 1)
-
-        # Format is "Event 2-1-1 (Position 2 of 3)"
-        assert "Event 2-1-1" in result
-        assert "Position 2" in result
-        assert "of 3" in result
-
-    def test_formats_position_not_in_schedule(self):
-        """Test formatting position when event is not in schedule."""
-        schedule = [
-            (1, 1, 1),
-            (3, 1, 1)
-        ]
-
-        result = get_schedule_position_text(schedule, 2, 1, 1)
-
-        # When not in schedule, returns just "Event 2-1-1" without position
-        assert result == "Event 2-1-1"
-
-    def test_empty_schedule(self):
-        """Test formatting with empty schedule."""
-        schedule = []
-
-        result = get_schedule_position_text(schedule, 1, 1, 1)
-
-        # Empty schedule returns just event text
-        assert result == "Event 1-1-1"
+    @pytest.mark.parametrize("schedule,event,rnd,heat,expected", [
+        (_SCHED, 2, 1, 1, "Event 2-1-1 (Position 2 of 3)"),
+        (_SCHED_GAP, 2, 1, 1, "Event 2-1-1"),
+        ([], 1, 1, 1, "Event 1-1-1"),
+    ], ids=["in_schedule", "not_in_schedule", "empty_schedule"])
+    def test_get_schedule_position_text(self, schedule, event, rnd, heat, expected):
+        """Test position text, which omits the position when not in schedule."""
+        assert get_schedule_position_text(schedule, event, rnd, heat) == expected
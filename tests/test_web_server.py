@@ -2,161 +2,330 @@
 Tests for web_server.py module.
 """
 
+import gzip
+import hashlib
+import io
 import json
-import sys
+import os
+import shutil
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import web_server
+from web_server import WebServer, start_web_server
+
+# Smallest valid upload payloads: one event with one athlete, scheduled once
+MINIMAL_EVENTS = "10,1,1,Test Event,,,,,,100\n,1,1,Smith,John,Test,,,,,,,123\n"
+MINIMAL_SCHEDULE = "event,round,heat\n10,1,1\n"
+
+
+def call_json(server, method_name, json=None):
+    """Call a WebServer handler inside a request context carrying a JSON body."""
+    with server.app.test_request_context(json=json):
+        return getattr(server, method_name)()
+
+
+def call_multipart(server, method_name, files):
+    """Call a WebServer handler inside a request context carrying file parts."""
+    data = {name: (io.BytesIO(content if isinstance(content, bytes) else content.encode('utf-8')), name)
+            for name, content in files.items()}
+    with server.app.test_request_context(data=data, content_type='multipart/form-data'):
+        return getattr(server, method_name)()
+
+
+def patch_view(mocker, server, endpoint, return_value):
+    """Replace the handler a route dispatches to for the duration of a test.
+
+    Routes are bound to the handler methods when the server is created, so
+    the app's view function is patched rather than the method.
+    """
+    handler = mocker.Mock(return_value=return_value)
+    mocker.patch.dict(server.app.view_functions, {endpoint: handler})
+    return handler
 
 
 class TestWebServerCreation:
     """Tests for WebServer class and start_web_server function."""
 
-    def test_creates_webserver_instance(self, populated_config_dir):
+    def test_creates_webserver_instance(self, readonly_config_dir):
         """Test that WebServer instance is created."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5001)
+        server = WebServer(str(readonly_config_dir), host="127.0.0.1", port=0)
 
         assert server is not None
-        assert server.config_dir == Path(populated_config_dir)
+        assert server.config_dir == Path(readonly_config_dir)
         assert server.host == "127.0.0.1"
-        assert server.port == 5001
+        assert server.port == 0
 
-    def test_start_web_server_function(self, populated_config_dir):
+    def test_start_web_server_function(self, populated_config_dir, mocker):
         """Test that start_web_server function works."""
-        from web_server import start_web_server
-
         # Don't actually start the server, just test instantiation
-        with patch('web_server.WebServer.start'):
-            server = start_web_server(str(populated_config_dir), "127.0.0.1", 5002)
-            assert server is not None
+        mocker.patch('web_server.WebServer.start')
+        server = start_web_server(str(populated_config_dir), "127.0.0.1", 0)
+        assert server is not None
+
+    @pytest.mark.skipif(not web_server.WAITRESS_AVAILABLE, reason="waitress not installed")
+    def test_start_serves_with_waitress_and_stops(self, readonly_config_dir):
+        """Test that start() serves requests through waitress and stop() shuts it down."""
+        import urllib.request
+
+        server = WebServer(str(readonly_config_dir), host="127.0.0.1", port=0)
+        server.start()
+        try:
+            url = f"http://127.0.0.1:{server.wsgi_server.effective_port}/api/current_event"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.status == 200
+                assert json.loads(response.read())['event'] == 1
+        finally:
+            server.stop()
+        server.server_thread.join(timeout=5)
+        assert not server.server_thread.is_alive()
+
+    def test_start_serves_with_werkzeug_fallback_and_stops(self, readonly_config_dir, monkeypatch):
+        """Test that the development-server fallback also serves requests and shuts down on stop()."""
+        import urllib.request
+
+        monkeypatch.setattr(web_server, 'WAITRESS_AVAILABLE', False)
+        server = WebServer(str(readonly_config_dir), host="127.0.0.1", port=0)
+        server.start()
+        try:
+            url = f"http://127.0.0.1:{server.wsgi_server.port}/api/current_event"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.status == 200
+        finally:
+            server.stop()
+        server.server_thread.join(timeout=5)
+        assert not server.server_thread.is_alive()
+
+    @pytest.mark.skipif(not web_server.ORJSON_AVAILABLE, reason="orjson not installed")
+    def test_json_round_trips_through_orjson(self, shared_web_server):
+        """Test that the orjson provider is installed and round-trips request/response JSON."""
+        assert isinstance(shared_web_server.app.json, web_server.OrjsonProvider)
+
+        payload = {"name": "Zoë", "count": 3, "ratio": 0.5, "items": [1, None, True]}
+        with shared_web_server.app.test_request_context(json=payload):
+            assert web_server.request.get_json() == payload
+            response = web_server.jsonify(payload)
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.get_data()) == payload
+
+    @pytest.mark.skipif(not web_server.ORJSON_AVAILABLE, reason="orjson not installed")
+    def test_orjson_provider_honours_sort_keys(self, shared_web_server, monkeypatch):
+        """Test that jsonify() output keeps Flask's sorted keys unless sort_keys is turned off."""
+        payload = {"zeta": 1, "alpha": {"y": 2, "b": 3}}
+        with shared_web_server.app.test_request_context():
+            assert web_server.jsonify(payload).get_data() == b'{"alpha":{"b":3,"y":2},"zeta":1}'
+
+            monkeypatch.setattr(shared_web_server.app.json, 'sort_keys', False)
+            assert web_server.jsonify(payload).get_data() == b'{"zeta":1,"alpha":{"y":2,"b":3}}'
 
 
 class TestWebServerRoutes:
     """Tests for WebServer route handlers."""
 
-    # Removed setup_method since each test creates its own WebServer with populated_config_dir fixture
-
-    def test_get_events_endpoint(self, populated_config_dir):
+    def test_get_events_endpoint(self, shared_web_server, client, mocker):
         """Test GET /api/events endpoint."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5010)
-
-        with server.app.test_client() as client:
-            with patch.object(server, '_get_events', return_value=[]):
-                response = client.get('/api/events')
-                assert response.status_code == 200
+        handler = patch_view(mocker, shared_web_server, 'get_events', [])
+        response = client.get('/api/events')
+        assert response.status_code == 200
+        handler.assert_called_once()
 
-    def test_get_current_event_endpoint(self, populated_config_dir):
+    def test_get_current_event_endpoint(self, shared_web_server, client, mocker):
         """Test GET /api/current_event endpoint."""
-        from web_server import WebServer
+        patch_view(mocker, shared_web_server, 'get_current_event', {"event": 1, "round": 1, "heat": 1})
+        response = client.get('/api/current_event')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert "event" in data
 
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5011)
-
-        with server.app.test_client() as client:
-            with patch.object(server, '_get_current_event', return_value={"event": 1, "round": 1, "heat": 1}):
-                response = client.get('/api/current_event')
-                assert response.status_code == 200
-                data = json.loads(response.data)
-                assert "event" in data
-
-    def test_set_current_event_endpoint(self, populated_config_dir):
+    def test_set_current_event_endpoint(self, shared_web_server, client, mocker):
         """Test POST /api/current_event endpoint."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5012)
-
-        with server.app.test_client() as client:
-            event_data = {"event": 5, "round": 2, "heat": 3}
-
-            with patch.object(server, '_set_current_event', return_value={"status": "success"}):
-                response = client.post(
-                    '/api/current_event',
-                    data=json.dumps(event_data),
-                    content_type='application/json'
-                )
-                assert response.status_code == 200
-
-    def test_get_teams_endpoint(self, populated_config_dir):
+        event_data = {"event": 5, "round": 2, "heat": 3}
+
+        handler = patch_view(mocker, shared_web_server, 'set_current_event', {"status": "success"})
+        response = client.post(
+            '/api/current_event',
+            data=json.dumps(event_data),
+            content_type='application/json'
+        )
+        assert response.status_code == 200
+        handler.assert_called_once()
+
+    def test_get_teams_endpoint(self, shared_web_server, client, mocker):
         """Test GET /api/teams endpoint."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5013)
+        handler = patch_view(mocker, shared_web_server, 'get_teams', {})
+        response = client.get('/api/teams')
+        assert response.status_code == 200
+        handler.assert_called_once()
 
-        with server.app.test_client() as client:
-            with patch.object(server, '_get_teams', return_value={}):
-                response = client.get('/api/teams')
-                assert response.status_code == 200
-
-    def test_set_teams_endpoint(self, populated_config_dir):
+    def test_set_teams_endpoint(self, shared_web_server, client, mocker):
         """Test POST /api/teams endpoint."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5014)
-
-        with server.app.test_client() as client:
-            colors_data = {"Monroe Jefferson": {"bgcolor": "#ff0000", "text": "#ffffff"}}
-
-            with patch.object(server, '_set_teams', return_value={"status": "success"}):
-                response = client.post(
-                    '/api/teams',
-                    data=json.dumps(colors_data),
-                    content_type='application/json'
-                )
-                assert response.status_code == 200
+        colors_data = {"Monroe Jefferson": {"bgcolor": "#ff0000", "text": "#ffffff"}}
+
+        handler = patch_view(mocker, shared_web_server, 'set_teams', {"status": "success"})
+        response = client.post(
+            '/api/teams',
+            data=json.dumps(colors_data),
+            content_type='application/json'
+        )
+        assert response.status_code == 200
+        handler.assert_called_once()
+
+    def test_static_page_served_from_cache_with_etag(self, client):
+        """Test that static pages carry an ETag and answer 304 when it matches."""
+        response = client.get('/teams')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/html'
+        assert response.headers['ETag']
+
+        response = client.get('/teams', headers={'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 304
+
+    def test_static_page_gzipped_when_accepted(self, client):
+        """Test that static pages are sent pre-gzipped, with a distinct ETag, when accepted."""
+        plain = client.get('/display')
+        compressed = client.get('/display', headers={'Accept-Encoding': 'gzip'})
+
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(compressed.data) == plain.data
+        assert compressed.headers['ETag'] != plain.headers['ETag']
+
+    @pytest.mark.parametrize("path", ['/api/events', '/api/teams'])
+    def test_api_answers_304_when_etag_matches(self, client, path):
+        """Test that polled API responses carry an ETag and answer 304 when it matches."""
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+        response = client.get(path, headers={'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_display_settings_etag_changes_after_save(self, populated_config_dir, settings_toml_fixture):
+        """Test that saving display settings invalidates the settings ETag."""
+        shutil.copy(settings_toml_fixture, populated_config_dir / "settings.toml")
+        client = WebServer(str(populated_config_dir), host="127.0.0.1", port=0).app.test_client()
+
+        etag = client.get('/api/display_settings').headers['ETag']
+        response = client.get('/api/display_settings', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+        client.post('/api/display_settings', json={"display": {"interval": 3.5}})
+        response = client.get('/api/display_settings', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['display']['interval'] == 3.5
 
 
 class TestWebServerMethods:
     """Tests for WebServer internal methods."""
 
-    def test_get_events_parses_lynx_file(self, populated_config_dir):
+    def test_get_events_parses_lynx_file(self, shared_web_server):
         """Test that get_events parses lynx.evt file."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5004)
-
-        with server.app.test_request_context():
-            response, status = server._get_events()
-            assert status == 200
-            data = response.get_json()
-            assert 'events' in data
-            assert len(data['events']) > 0
-
-    def test_get_current_event_loads_json(self, populated_config_dir):
+        server = shared_web_server
+
+        response, status = call_json(server, '_get_events')
+        assert status == 200
+        data = response.get_json()
+        assert 'events' in data
+        assert len(data['events']) > 0
+
+    def test_get_events_cached_until_files_change(self, populated_config_dir, mocker):
+        """Test that get_events reuses the cached response until lynx.evt is rewritten."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+        parse_spy = mocker.spy(web_server, 'parse_lynx_text')
+
+        first, _ = call_json(server, '_get_events')
+        second, status = call_json(server, '_get_events')
+        assert status == 200
+        assert parse_spy.call_count == 1
+        assert second.get_json() == first.get_json()
+
+        response, status = call_json(server, '_upload_events', json={"content": MINIMAL_EVENTS})
+        assert status == 200
+
+        response, status = call_json(server, '_get_events')
+        assert [e['event'] for e in response.get_json()['events']] == [10]
+
+    def test_get_events_gzipped_when_accepted(self, populated_config_dir):
+        """Test that large events responses are gzipped only for clients that accept it."""
+        (populated_config_dir / "lynx.evt").write_text(
+            "".join(f"{e},1,1,Event {e}\n,1,1,Smith,John,Test\n" for e in range(1, 60)))
+        client = WebServer(str(populated_config_dir), host="127.0.0.1", port=0).app.test_client()
+
+        plain = client.get('/api/events')
+        assert 'Content-Encoding' not in plain.headers
+        assert len(plain.get_json()['events']) == 59
+
+        compressed = client.get('/api/events', headers={'Accept-Encoding': 'gzip'})
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in compressed.headers['Vary']
+        assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+
+    def test_display_settings_cached_until_updated(self, populated_config_dir, settings_toml_fixture, mocker):
+        """Test that settings.toml is parsed once and saves update the cached parse."""
+        shutil.copy(settings_toml_fixture, populated_config_dir / "settings.toml")
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+        loads_spy = mocker.spy(web_server.tomllib, 'loads')
+
+        call_json(server, '_get_display_settings')
+        response, status = call_json(server, '_get_display_settings')
+        assert status == 200
+        assert loads_spy.call_count == 1
+        assert response.get_json()['display']['interval'] == 2.0
+
+        response, status = call_json(server, '_set_display_settings', json={"display": {"interval": 3.5}})
+        assert status == 200
+
+        # The save primes the cache, so nothing is parsed again
+        response, status = call_json(server, '_get_display_settings')
+        assert response.get_json()['display']['interval'] == 3.5
+        assert loads_spy.call_count == 1
+
+    def test_set_display_settings_unchanged_skips_write(self, populated_config_dir, settings_toml_fixture):
+        """Test that re-submitting current values leaves settings.toml untouched."""
+        settings_file = populated_config_dir / "settings.toml"
+        shutil.copy(settings_toml_fixture, settings_file)
+        original = settings_file.read_bytes()
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+
+        response, status = call_json(server, '_set_display_settings', json={"display": {"interval": "2"}})
+        assert status == 200
+        assert response.get_json()['display']['interval'] == 2.0
+        assert settings_file.read_bytes() == original
+
+    @pytest.mark.parametrize("display,err_contains", [
+        ({"line_height": "tall"}, "line_height must be an integer"),
+        ({"header_rows": 0}, "header_rows must be a positive integer"),
+        ({"interval": None}, "interval must be a number"),
+        ({"brightness": None}, "brightness must not be null"),
+        ({"extra": {"levels": [1, None]}}, "extra must not be null"),
+        ({"interval": -1}, "interval must be a positive number"),
+    ])
+    def test_set_display_settings_validation_errors(self, shared_web_server, display, err_contains):
+        """Test that invalid numeric and null display settings are rejected."""
+        response, status = call_json(shared_web_server, '_set_display_settings', json={"display": display})
+        assert status == 400
+        assert err_contains in response.get_json()['error']
+
+    def test_get_current_event_loads_json(self, shared_web_server):
         """Test that get_current_event loads current_event.json."""
-        from web_server import WebServer
+        server = shared_web_server
 
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5005)
-
-        with server.app.test_request_context():
-            response, status = server._get_current_event()
-            assert status == 200
-            data = response.get_json()
-            assert "event" in data
-            assert "round" in data
-            assert "heat" in data
+        response, status = call_json(server, '_get_current_event')
+        assert status == 200
+        data = response.get_json()
+        assert "event" in data
+        assert "round" in data
+        assert "heat" in data
 
     def test_set_current_event_saves_json(self, populated_config_dir):
         """Test that set_current_event saves to current_event.json."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5006)
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
         new_event = {"event": 7, "round": 3, "heat": 2}
 
-
-        with server.app.test_request_context(json=new_event):
-
-
-            response, status = server._set_current_event()
-
-
-            assert status == 200
+        response, status = call_json(server, '_set_current_event', json=new_event)
+        assert status == 200
 
         # Verify file was updated
         event_file = Path(populated_config_dir) / "current_event.json"
@@ -169,38 +338,77 @@ class TestWebServerMethods:
 
     def test_set_current_event_triggers_reload(self, populated_config_dir):
         """Test that set_current_event successfully updates event."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5007)
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
         new_event = {"event": 3, "round": 1, "heat": 1}
 
+        response, status = call_json(server, '_set_current_event', json=new_event)
+        assert status == 200
+
+    @pytest.mark.parametrize("method", ['_set_current_event', '_set_teams', '_set_display_settings'])
+    @pytest.mark.parametrize("body,err_contains", [
+        (b'', 'Missing'),
+        (b'{not json', 'Invalid JSON body'),
+        (b'[1, 2, 3]', 'Invalid JSON body'),
+    ], ids=["empty", "malformed", "array"])
+    def test_set_rejects_non_object_body(self, shared_web_server, method, body, err_contains):
+        """Test that setters answer 400 rather than 500 when the body isn't a JSON object."""
+        with shared_web_server.app.test_request_context(data=body, content_type='application/json'):
+            response, status = getattr(shared_web_server, method)()
+        assert status == 400
+        assert err_contains in response.get_json()['error']
+
+    def test_upload_rejects_malformed_json(self, shared_web_server):
+        """Test that uploads report a malformed JSON body instead of a missing field."""
+        with shared_web_server.app.test_request_context(data=b'{"content": ', content_type='application/json'):
+            response, status = shared_web_server._upload_events()
+        assert status == 400
+        assert response.get_json()['error'] == 'Invalid JSON body'
+
+    def test_replace_file_concurrent_writers(self, tmp_path):
+        """Test that concurrent saves of one file never collide on its temp file."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        target = tmp_path / "current_event.json"
+        payloads = [f'{{"event": {i}}}'.encode() for i in range(200)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda data: WebServer._replace_file(target, data), payloads))
+
+        assert all(results)
+        assert target.read_bytes() in payloads
+        assert list(tmp_path.iterdir()) == [target]
+
+    def test_set_current_event_unchanged_skips_write(self, populated_config_dir, mocker):
+        """Test that re-posting the current selection leaves current_event.json alone."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+        event_file = Path(populated_config_dir) / "current_event.json"
+        new_event = {"event": 7, "round": 3, "heat": 2}
 
-        with server.app.test_request_context(json=new_event):
-
-
-            response, status = server._set_current_event()
+        call_json(server, '_set_current_event', json=new_event)
+        assert not event_file.with_name("current_event.json.tmp").exists()
 
+        replace_spy = mocker.spy(web_server.os, 'replace')
+        response, status = call_json(server, '_set_current_event', json=new_event)
+        assert status == 200
+        assert response.get_json()['current_event'] == new_event
+        assert replace_spy.call_count == 0
 
-            assert status == 200
+        call_json(server, '_set_current_event', json={"event": 8, "round": 1, "heat": 1})
+        assert replace_spy.call_count == 1
+        assert json.loads(event_file.read_text())["event"] == 8
 
-    def test_get_teams_loads_csv(self, populated_config_dir):
+    def test_get_teams_loads_csv(self, shared_web_server):
         """Test that get_teams loads colors.csv."""
-        from web_server import WebServer
+        server = shared_web_server
 
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5008)
-
-        with server.app.test_request_context():
-            response, status = server._get_teams()
-            assert status == 200
-            data = response.get_json()
-            assert 'teams' in data
+        response, status = call_json(server, '_get_teams')
+        assert status == 200
+        data = response.get_json()
+        assert 'teams' in data
 
     def test_set_teams_saves_csv(self, populated_config_dir):
         """Test that set_teams saves to colors.csv."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5009)
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
         new_teams = [
             {
@@ -211,9 +419,72 @@ class TestWebServerMethods:
             }
         ]
 
-        with server.app.test_request_context(json={"teams": new_teams}):
-            response, status = server._set_teams()
-            assert status == 200
+        response, status = call_json(server, '_set_teams', json={"teams": new_teams})
+        assert status == 200
+        colors_file = Path(populated_config_dir) / "colors.csv"
+        assert colors_file.read_text() == "affiliation,name,bgcolor,text\nTEST,Test Team,#123456,#fedcba\n"
+
+    def test_get_teams_cached_until_updated(self, populated_config_dir, mocker):
+        """Test that colors.csv is parsed once per change and updates are read back."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+        reader_spy = mocker.spy(web_server.csv, 'reader')
+
+        first, _ = call_json(server, '_get_teams')
+        second, status = call_json(server, '_get_teams')
+        assert status == 200
+        assert reader_spy.call_count == 1
+        assert second.get_json() == first.get_json()
+
+        new_teams = [{"affiliation": "NEW", "name": "New Team", "bgcolor": "#123456", "text": "#fedcba"}]
+        call_json(server, '_set_teams', json={"teams": new_teams})
+
+        response, status = call_json(server, '_get_teams')
+        assert response.get_json()['teams'] == new_teams
+
+    def test_set_teams_quotes_fields_when_needed(self, populated_config_dir):
+        """Test that team names containing commas or quotes round-trip through colors.csv."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+        new_teams = [
+            {"affiliation": "PLAIN", "name": "Plain Team", "bgcolor": "#000000", "text": "#ffffff"},
+            {"affiliation": "ODD", "name": 'Smith, "The" Team', "bgcolor": "#111111", "text": "#eeeeee"},
+        ]
+
+        response, status = call_json(server, '_set_teams', json={"teams": new_teams})
+        assert status == 200
+
+        response, status = call_json(server, '_get_teams')
+        assert response.get_json()['teams'] == new_teams
+
+    def test_add_missing_teams_adds_each_team_once(self, populated_config_dir):
+        """Test that add_missing_teams appends lynx.evt teams that colors.csv lacks, once."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+
+        response, status = call_json(server, '_add_missing_teams')
+        assert status == 200
+        added = response.get_json()['teams']
+        assert added == sorted(added)
+        assert response.get_json()['added_count'] == len(added) > 0
+        # Relay entries like 'ddcm  A' aren't teams of their own
+        assert not any(' ' in team for team in added)
+
+        response, status = call_json(server, '_add_missing_teams')
+        assert status == 200
+        assert response.get_json()['added_count'] == 0
+
+    def test_encode_csv_matches_csv_writer(self):
+        """Test that the direct CSV encoder produces exactly what csv.writer does."""
+        import csv
+        rows = [
+            ('PLAIN', 'Plain Team', '#000000', '#ffffff'),
+            ('ODD', 'Smith, "The" Team', 'multi\nline', 'cr\r'),
+            ('', 'Zoë', '', '#abcdef'),
+        ]
+        expected = io.StringIO()
+        writer = csv.writer(expected)
+        writer.writerow(web_server.TEAM_FIELDS)
+        writer.writerows(rows)
+
+        assert web_server._encode_csv(web_server.TEAM_FIELDS, rows) == expected.getvalue().encode('utf-8')
 
 
 class TestWebServerFileUpload:
@@ -221,23 +492,16 @@ class TestWebServerFileUpload:
 
     def test_upload_events_success(self, populated_config_dir):
         """Test successful events file upload."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5020)
-
-        # Read sample events file
-        sample_file = Path(__file__).parent / "fixtures" / "sample_lynx.evt"
-        with open(sample_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
+        content = MINIMAL_EVENTS
         data = {"content": content}
 
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_events()
-            assert status == 200
-            result = response.get_json()
-            assert result['success'] is True
-            assert result['event_count'] > 0
+        response, status = call_json(server, '_upload_events', json=data)
+        assert status == 200
+        result = response.get_json()
+        assert result['success'] is True
+        assert result['event_count'] == 1
 
         # Verify backup was created
         backup_file = Path(populated_config_dir) / "lynx.evt.bak"
@@ -249,70 +513,162 @@ class TestWebServerFileUpload:
             saved_content = f.read()
         assert saved_content == content
 
-    def test_upload_events_missing_content(self, populated_config_dir):
-        """Test events upload with missing content field."""
-        from web_server import WebServer
+    def test_backup_file_missing_source_keeps_backup(self, tmp_path):
+        """Test that backing up a file that doesn't exist leaves the old backup alone."""
+        server = WebServer(str(tmp_path), host="127.0.0.1", port=0)
+        backup_file = tmp_path / "lynx.evt.bak"
+        backup_file.write_text("previous")
 
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5021)
+        server._backup_file(tmp_path / "lynx.evt")
+        assert backup_file.read_text() == "previous"
 
-        data = {}
+    def test_upload_events_backup_keeps_previous_content(self, populated_config_dir):
+        """Test that each upload replaces the backup with the file it overwrote."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+        events_file = Path(populated_config_dir) / "lynx.evt"
+        backup_file = Path(populated_config_dir) / "lynx.evt.bak"
+        second = MINIMAL_EVENTS.replace("Test Event", "Second Event")
 
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_events()
-            assert status == 400
-            result = response.get_json()
-            assert 'error' in result
-            assert 'content' in result['error'].lower()
+        call_json(server, '_upload_events', json={"content": MINIMAL_EVENTS})
+        response, status = call_json(server, '_upload_events', json={"content": second})
+        assert status == 200
+
+        assert backup_file.read_text(encoding='utf-8') == MINIMAL_EVENTS
+        assert events_file.read_text(encoding='utf-8') == second
+
+    def test_upload_events_multipart(self, populated_config_dir):
+        """Test events upload sent as a multipart file part."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+
+        response, status = call_multipart(server, '_upload_events', {"content": MINIMAL_EVENTS})
+        assert status == 200
+        assert response.get_json()['event_count'] == 1
+        assert (Path(populated_config_dir) / "lynx.evt").read_text(encoding='utf-8') == MINIMAL_EVENTS
 
-    def test_upload_events_empty_content(self, populated_config_dir):
-        """Test events upload with empty content."""
-        from web_server import WebServer
+    def test_upload_events_plain_text_body(self, populated_config_dir):
+        """Test events upload sent as a text/plain request body."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5022)
+        with server.app.test_request_context(data=MINIMAL_EVENTS, content_type='text/plain'):
+            response, status = server._upload_events()
+        assert status == 200
+        assert response.get_json()['event_count'] == 1
+        assert (Path(populated_config_dir) / "lynx.evt").read_text(encoding='utf-8') == MINIMAL_EVENTS
+
+    def test_upload_events_rejects_non_utf8_plain_text(self, shared_web_server):
+        """Test a text/plain upload that isn't UTF-8 is a client error."""
+        server = shared_web_server
+        events_file = server._lynx_file
+        original = events_file.read_bytes()
 
-        data = {"content": "   "}
+        with server.app.test_request_context(data=b'\xff\xfe1,1,1,Event', content_type='text/plain'):
+            response, status = server._upload_events()
+        assert status == 400
+        assert response.get_json()['error'] == 'Upload must be UTF-8 text'
+        assert events_file.read_bytes() == original
+
+    @pytest.mark.parametrize("method_name,files", [
+        ('_upload_events', {"content": b'\xff\xfe1,1,1,Event'}),
+        ('_upload_schedule', {"content": b'\xff\xfe1,1,1'}),
+        ('_upload_combined', {"events": MINIMAL_EVENTS, "schedule": b'\xff\xfe1,1,1'}),
+    ])
+    def test_upload_rejects_non_utf8_multipart(self, shared_web_server, method_name, files):
+        """Test a multipart file part that isn't UTF-8 is a client error."""
+        response, status = call_multipart(shared_web_server, method_name, files)
+        assert status == 400
+        assert response.get_json()['error'] == 'Upload must be UTF-8 text'
+
+    def test_upload_events_matching_hash_skips_write(self, populated_config_dir):
+        """Test events upload reports unchanged and leaves files alone when X-Content-Hash matches."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+        events_file = Path(populated_config_dir) / "lynx.evt"
+        original = events_file.read_bytes()
+        headers = {'X-Content-Hash': hashlib.sha256(original).hexdigest()}
 
-        with server.app.test_request_context(json=data):
+        with server.app.test_request_context(json={"content": MINIMAL_EVENTS}, headers=headers):
             response, status = server._upload_events()
-            assert status == 400
-            result = response.get_json()
-            assert 'error' in result
-            assert 'empty' in result['error'].lower()
+
+        assert status == 200
+        assert response.get_json() == {'success': True, 'unchanged': True}
+        assert events_file.read_bytes() == original
+        assert not (Path(populated_config_dir) / "lynx.evt.bak").exists()
+
+    def test_upload_schedule_matching_hash_revalidates_after_events_change(self, populated_config_dir):
+        """Test a matching schedule hash skips the upload only while lynx.evt is older than lynx.sch."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+        call_json(server, '_upload_combined', json={"events": MINIMAL_EVENTS, "schedule": MINIMAL_SCHEDULE})
+        events_file = Path(populated_config_dir) / "lynx.evt"
+        schedule_file = Path(populated_config_dir) / "lynx.sch"
+        headers = {'X-Content-Hash': hashlib.sha256(schedule_file.read_bytes()).hexdigest()}
+        data = {"content": MINIMAL_SCHEDULE}
+
+        sched_mtime = schedule_file.stat().st_mtime_ns
+        os.utime(events_file, ns=(sched_mtime, sched_mtime))
+        with server.app.test_request_context(json=data, headers=headers):
+            response, status = server._upload_schedule()
+        assert status == 200
+        assert response.get_json() == {'success': True, 'unchanged': True}
+
+        os.utime(events_file, ns=(sched_mtime + 1_000_000_000, sched_mtime + 1_000_000_000))
+        with server.app.test_request_context(json=data, headers=headers):
+            response, status = server._upload_schedule()
+        assert status == 200
+        assert response.get_json()['valid_entries'] == 1
+
+    def test_upload_combined_stale_hash_uploads(self, populated_config_dir):
+        """Test combined upload proceeds when X-Content-Hash doesn't match the files on disk."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+        headers = {'X-Content-Hash': f"{'0' * 64},{'0' * 64}"}
+        data = {"events": MINIMAL_EVENTS, "schedule": MINIMAL_SCHEDULE}
+
+        with server.app.test_request_context(json=data, headers=headers):
+            _, status = server._upload_combined()
+
+        assert status == 200
+
+    @pytest.mark.parametrize("method,payload,err_contains", [
+        ('_upload_events', {}, 'content'),
+        ('_upload_events', {"content": "   "}, 'empty'),
+        ('_upload_schedule', {}, 'content'),
+        ('_upload_schedule', {"content": "   "}, 'empty'),
+        ('_upload_combined', {"schedule": "event,round,heat\n1,1,1\n"}, 'events'),
+        ('_upload_combined', {"events": MINIMAL_EVENTS}, 'schedule'),
+    ], ids=["events_missing_content", "events_empty_content",
+            "schedule_missing_content", "schedule_empty_content",
+            "combined_missing_events", "combined_missing_schedule"])
+    def test_upload_validation_errors(self, shared_web_server, method, payload, err_contains):
+        """Test uploads with missing or empty fields are rejected before any write."""
+        response, status = call_json(shared_web_server, method, json=payload)
+        assert status == 400
+        result = response.get_json()
+        assert 'error' in result
+        assert err_contains in result['error'].lower()
 
     def test_upload_events_invalid_format(self, populated_config_dir):
         """Test events upload with invalid format."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5023)
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
         data = {"content": "not,valid,csv,format\nwith,random,data"}
 
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_events()
-            assert status == 400
-            result = response.get_json()
-            assert 'error' in result
+        response, status = call_json(server, '_upload_events', json=data)
+        assert status == 400
+        result = response.get_json()
+        assert 'error' in result
 
     def test_upload_schedule_success(self, populated_config_dir):
         """Test successful schedule file upload."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5024)
-
-        # Read sample schedule file
-        sample_file = Path(__file__).parent / "fixtures" / "sample_schedule.sch"
-        with open(sample_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
+        # Event 2-1-1 exists in the sample lynx.evt already in the config dir
+        content = "event,round,heat\n2,1,1\n"
         data = {"content": content}
 
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_schedule()
-            assert status == 200
-            result = response.get_json()
-            assert result['success'] is True
-            assert result['total_entries'] > 0
-            assert result['valid_entries'] >= 0
+        response, status = call_json(server, '_upload_schedule', json=data)
+        assert status == 200
+        result = response.get_json()
+        assert result['success'] is True
+        assert result['total_entries'] == 1
+        assert result['valid_entries'] == 1
 
         # Verify file was updated
         schedule_file = Path(populated_config_dir) / "lynx.sch"
@@ -321,154 +677,80 @@ class TestWebServerFileUpload:
             saved_content = f.read()
         assert saved_content == content
 
-    def test_upload_schedule_missing_content(self, populated_config_dir):
-        """Test schedule upload with missing content field."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5025)
-
-        data = {}
-
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_schedule()
-            assert status == 400
-            result = response.get_json()
-            assert 'error' in result
-            assert 'content' in result['error'].lower()
-
-    def test_upload_schedule_empty_content(self, populated_config_dir):
-        """Test schedule upload with empty content."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5026)
-
-        data = {"content": "   "}
-
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_schedule()
-            assert status == 400
-            result = response.get_json()
-            assert 'error' in result
-            assert 'empty' in result['error'].lower()
-
     def test_upload_schedule_validates_against_events(self, populated_config_dir):
         """Test schedule upload validates entries against events."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5027)
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
         # Create schedule with non-existent events
         content = "; Test schedule\nevent,round,heat\n999,999,999\n"
 
         data = {"content": content}
 
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_schedule()
-            assert status == 400
-            result = response.get_json()
-            assert 'error' in result
-            # Should fail because no valid entries match events
+        response, status = call_json(server, '_upload_schedule', json=data)
+        assert status == 400
+        result = response.get_json()
+        assert 'error' in result
+        # Should fail because no valid entries match events
 
-    def test_upload_combined_success(self, populated_config_dir):
+    def test_upload_combined_success(self, populated_config_dir, sample_events_content,
+                                     sample_schedule_content):
         """Test successful combined upload of both files."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5028)
-
-        # Read sample files
-        events_file = Path(__file__).parent / "fixtures" / "sample_lynx.evt"
-        schedule_file = Path(__file__).parent / "fixtures" / "sample_schedule.sch"
-
-        with open(events_file, 'r', encoding='utf-8') as f:
-            events_content = f.read()
-
-        with open(schedule_file, 'r', encoding='utf-8') as f:
-            schedule_content = f.read()
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
         data = {
-            "events": events_content,
-            "schedule": schedule_content
+            "events": sample_events_content,
+            "schedule": sample_schedule_content
         }
 
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_combined()
-            assert status == 200
-            result = response.get_json()
-            assert result['success'] is True
-            assert 'events' in result
-            assert 'schedule' in result
-            assert result['events']['event_count'] > 0
-            assert result['schedule']['valid_entries'] > 0
+        response, status = call_json(server, '_upload_combined', json=data)
+        assert status == 200
+        result = response.get_json()
+        assert result['success'] is True
+        assert 'events' in result
+        assert 'schedule' in result
+        assert result['events']['event_count'] > 0
+        assert result['schedule']['valid_entries'] > 0
 
         # Verify files were created/updated
         assert (Path(populated_config_dir) / "lynx.evt").exists()
         assert (Path(populated_config_dir) / "lynx.sch").exists()
 
-    def test_upload_combined_missing_events(self, populated_config_dir):
-        """Test combined upload with missing events field."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5029)
-
-        data = {
-            "schedule": "event,round,heat\n1,1,1\n"
-        }
-
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_combined()
-            assert status == 400
-            result = response.get_json()
-            assert 'error' in result
-            assert 'events' in result['error'].lower()
-
-    def test_upload_combined_missing_schedule(self, populated_config_dir):
-        """Test combined upload with missing schedule field."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5030)
-
-        sample_file = Path(__file__).parent / "fixtures" / "sample_lynx.evt"
-        with open(sample_file, 'r', encoding='utf-8') as f:
-            events_content = f.read()
-
-        data = {
-            "events": events_content
-        }
-
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_combined()
-            assert status == 400
-            result = response.get_json()
-            assert 'error' in result
-            assert 'schedule' in result['error'].lower()
-
     def test_upload_combined_validates_schedule_against_new_events(self, populated_config_dir):
         """Test combined upload validates schedule against new events (not old)."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5031)
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
         # Create new events and matching schedule
-        events_content = "10,1,1,Test Event,,,,,,100\n,1,1,Smith,John,Test,,,,,,,123\n"
-        schedule_content = "event,round,heat\n10,1,1\n"
-
         data = {
-            "events": events_content,
-            "schedule": schedule_content
+            "events": MINIMAL_EVENTS,
+            "schedule": MINIMAL_SCHEDULE
         }
 
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_combined()
-            assert status == 200
-            result = response.get_json()
-            assert result['success'] is True
-            assert result['schedule']['valid_entries'] == 1
+        response, status = call_json(server, '_upload_combined', json=data)
+        assert status == 200
+        result = response.get_json()
+        assert result['success'] is True
+        assert result['schedule']['valid_entries'] == 1
+
+    def test_upload_combined_multipart(self, populated_config_dir):
+        """Test combined upload sent as multipart file parts."""
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
+
+        files = {"events": MINIMAL_EVENTS, "schedule": MINIMAL_SCHEDULE}
+        response, status = call_multipart(server, '_upload_combined', files)
+        assert status == 200
+        result = response.get_json()
+        assert result['events']['event_count'] == 1
+        assert result['schedule']['valid_entries'] == 1
+
+    def test_upload_combined_multipart_missing_part(self, shared_web_server):
+        """Test combined multipart upload without a schedule part is rejected."""
+        response, status = call_multipart(shared_web_server, '_upload_combined', {"events": MINIMAL_EVENTS})
+        assert status == 400
+        assert 'schedule' in response.get_json()['error'].lower()
 
     def test_upload_combined_atomic_rollback(self, populated_config_dir):
         """Test that combined upload doesn't update if schedule validation fails."""
-        from web_server import WebServer
-
-        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=5032)
+        server = WebServer(str(populated_config_dir), host="127.0.0.1", port=0)
 
         # Get original events file content
         events_file = Path(populated_config_dir) / "lynx.evt"
@@ -476,17 +758,15 @@ class TestWebServerFileUpload:
             original_events = f.read()
 
         # Try to upload with valid events but invalid schedule (no matching entries)
-        events_content = "10,1,1,Test Event,,,,,,100\n,1,1,Smith,John,Test,,,,,,,123\n"
         schedule_content = "event,round,heat\n999,1,1\n"  # Non-existent event
 
         data = {
-            "events": events_content,
+            "events": MINIMAL_EVENTS,
             "schedule": schedule_content
         }
 
-        with server.app.test_request_context(json=data):
-            response, status = server._upload_combined()
-            assert status == 400  # Should fail validation
+        response, status = call_json(server, '_upload_combined', json=data)
+        assert status == 400  # Should fail validation
 
         # Verify original events file was not changed
         with open(events_file, 'r', encoding='utf-8') as f:
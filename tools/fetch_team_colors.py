@@ -2,26 +2,56 @@
 """
 Fetch team badge colors from athletic.net team page.
 
+The page is first fetched with a plain HTTP GET. If the badge colors are not
+in the server-rendered HTML, a headless Chrome browser renders the page
+instead (or use --use-browser to go straight to the browser).
+
+Results are cached for 30 days in ~/.cache/ledpanels/team_colors.json so
+repeated runs don't fetch the same team again (use --force-refresh to bypass).
+
 Usage:
-    python fetch_team_colors.py <team_id>
+    python fetch_team_colors.py <team_id> [--use-browser] [--force-refresh] [--debug]
+    python fetch_team_colors.py --batch-file <file|-> [--use-browser] [--force-refresh] [--debug]
+
+Batch mode reads one team ID per line and reuses a single browser for every
+team that needs the browser fallback.
 
 Example:
     python fetch_team_colors.py 12345
+    printf '12345\n67890\n' | python fetch_team_colors.py --batch-file -
 
 Requirements:
-    pip install selenium beautifulsoup4
+    pip install requests lxml
+    pip install beautifulsoup4    # only needed for --debug output
+    pip install selenium          # only needed for the browser fallback
 """
 
+import argparse
+import json
+import os
 import re
 import sys
 import time
+from pathlib import Path
+
+import lxml.etree
+import lxml.html
+import requests
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+CACHE_PATH = Path.home() / '.cache' / 'ledpanels' / 'team_colors.json'
+CACHE_MAX_AGE = 30 * 86400  # seconds
+BADGE_WAIT_TIMEOUT = 10  # seconds
 
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+_RGB_RE = re.compile(r'rgb\((\d+),\s*(\d+),\s*(\d+)\)')
+_BG_RE = re.compile(r'background-color:\s*([^;]+)')
+
+# Style attributes of <span class="... badge-sport ..."> that set a background color
+_BADGE_STYLE_XPATH = (
+    "//span[contains(concat(' ', normalize-space(@class), ' '), ' badge-sport ')]"
+    "/@style[contains(., 'background-color')]"
+)
 
 
 def rgb_to_hex(rgb_string):
@@ -35,26 +65,45 @@ def rgb_to_hex(rgb_string):
         Hex color string like "#ffee44" or "#108810"
     """
     # Extract numbers from rgb string
-    match = re.search(r'rgb\((\d+),\s*(\d+),\s*(\d+)\)', rgb_string)
+    match = _RGB_RE.search(rgb_string)
     if not match:
         return None
 
     r, g, b = map(int, match.groups())
-    return f"#{r:02x}{g:02x}{b:02x}"
+    return "#%02x%02x%02x" % (r, g, b)
 
 
-def fetch_team_colors(team_id, debug=False):
+def fetch_page_static(url, debug=False):
     """
-    Fetch badge colors from athletic.net team page.
+    Fetch the server-rendered HTML of a page with a plain HTTP GET.
 
     Args:
-        team_id: The team ID number
+        url: Page URL
         debug: If True, print diagnostic information
 
     Returns:
-        Comma-separated hex color codes (e.g., "#ffee44,#108810")
+        Page HTML as a string
     """
-    url = f"https://www.athletic.net/team/{team_id}"
+    if debug:
+        print("Fetching page over HTTP...", file=sys.stderr)
+
+    response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=10)
+    response.raise_for_status()
+    return response.text
+
+
+def _make_driver(debug=False):
+    """
+    Start a headless Chrome driver.
+
+    Args:
+        debug: If True, print diagnostic information
+
+    Returns:
+        Selenium Chrome WebDriver
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
 
     # Set up Chrome options for headless browsing
     chrome_options = Options()
@@ -63,75 +112,258 @@ def fetch_team_colors(team_id, debug=False):
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--disable-gpu')
     chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
 
-    driver = None
-    try:
-        if debug:
-            print(f"\n=== DEBUG MODE ===", file=sys.stderr)
-            print(f"URL: {url}", file=sys.stderr)
-            print("Initializing browser...", file=sys.stderr)
+    if debug:
+        print("Initializing browser...", file=sys.stderr)
 
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get(url)
+    return webdriver.Chrome(options=chrome_options)
 
-        if debug:
-            print("Page loaded, waiting for content...", file=sys.stderr)
 
-        # Wait for badge elements to appear (max 10 seconds)
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "badge-sport"))
-            )
-            if debug:
-                print("Badge elements found!", file=sys.stderr)
-        except:
-            if debug:
-                print("Timeout waiting for badge-sport elements, proceeding anyway...", file=sys.stderr)
-            # Give it a bit more time
-            time.sleep(2)
+def _fetch_one(driver, url, debug=False):
+    """
+    Load a page in an existing driver and return the rendered HTML.
+
+    Args:
+        driver: Selenium WebDriver
+        url: Page URL
+        debug: If True, print diagnostic information
+
+    Returns:
+        Page HTML after JavaScript has rendered
+    """
+    from selenium.webdriver.common.by import By
 
-        # Get the page source after JavaScript has rendered
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
+    driver.get(url)
 
+    if debug:
+        print("Page loaded, waiting for content...", file=sys.stderr)
+
+    # Poll for badge elements with a growing interval (max 10 seconds) and
+    # stop once the badge count is unchanged across two polls
+    deadline = time.monotonic() + BADGE_WAIT_TIMEOUT
+    interval = 0.1
+    last_count = -1
+    while time.monotonic() < deadline:
+        count = len(driver.find_elements(By.CLASS_NAME, "badge-sport"))
+        if count and count == last_count:
+            if debug:
+                print(f"Found {count} badge elements", file=sys.stderr)
+            break
+        last_count = count
+        time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+        interval = min(interval * 1.5, 1.0)
+    else:
         if debug:
-            # Find all span elements with class "badge"
-            all_badges = soup.find_all('span', class_='badge')
-            print(f"\nFound {len(all_badges)} span elements with class 'badge'", file=sys.stderr)
+            print("Timeout waiting for badge-sport elements, proceeding anyway...", file=sys.stderr)
+
+    # Get the page source after JavaScript has rendered
+    return driver.page_source
+
+
+class BrowserSession:
+    """Headless Chrome driver started on first use and reused for later pages."""
+
+    def __init__(self, debug=False):
+        self.debug = debug
+        self.driver = None
+
+    def fetch(self, url):
+        """
+        Render a page and return the resulting HTML.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Page HTML after JavaScript has rendered
+        """
+        if self.driver is None:
+            self.driver = _make_driver(self.debug)
+        return _fetch_one(self.driver, url, self.debug)
+
+    def close(self):
+        """Quit the driver if one was started."""
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+
+
+def fetch_page_browser(url, debug=False):
+    """
+    Render a page in headless Chrome and return the resulting HTML.
+
+    Args:
+        url: Page URL
+        debug: If True, print diagnostic information
+
+    Returns:
+        Page HTML after JavaScript has rendered
+    """
+    browser = BrowserSession(debug)
+    try:
+        return browser.fetch(url)
+    finally:
+        browser.close()
+
+
+def print_badge_debug(page_source):
+    """
+    Print the first badges found in team page HTML (for --debug).
+
+    Args:
+        page_source: Team page HTML
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_source, 'lxml')
+
+    # Find the first 10 span elements with class "badge"
+    all_badges = soup.find_all('span', class_='badge', limit=10)
+    print(f"\nShowing {len(all_badges)} span elements with class 'badge' (max 10)", file=sys.stderr)
+
+    for i, badge in enumerate(all_badges):
+        print(f"\nBadge {i+1}:", file=sys.stderr)
+        print(f"  Classes: {badge.get('class', [])}", file=sys.stderr)
+        print(f"  Style: {badge.get('style', 'None')}", file=sys.stderr)
+        print(f"  Text: {badge.get_text(strip=True)}", file=sys.stderr)
+
+    # Also look for badge-sport specifically
+    badge_sport = soup.find_all('span', class_='badge-sport', limit=10)
+    print(f"\nShowing {len(badge_sport)} span elements with class 'badge-sport' (max 10)", file=sys.stderr)
+
+    for i, badge in enumerate(badge_sport):
+        print(f"\nBadge-sport {i+1}:", file=sys.stderr)
+        print(f"  Classes: {badge.get('class', [])}", file=sys.stderr)
+        print(f"  Style: {badge.get('style', 'None')}", file=sys.stderr)
+        print(f"  Text: {badge.get_text(strip=True)}", file=sys.stderr)
+
+    print(f"\n=================\n", file=sys.stderr)
+
+
+def extract_badge_colors(page_source, debug=False):
+    """
+    Extract badge background colors from team page HTML.
+
+    Args:
+        page_source: Team page HTML
+        debug: If True, print the first badges found
+
+    Returns:
+        List of hex color strings (may be empty)
+    """
+    if debug:
+        print_badge_debug(page_source)
+
+    # lxml refuses to parse an empty document
+    if not page_source.strip():
+        return []
+
+    colors = []
+    for style in lxml.html.fromstring(page_source).xpath(_BADGE_STYLE_XPATH):
+        # Extract the background-color value
+        match = _BG_RE.search(style)
+        if match:
+            hex_color = rgb_to_hex(match.group(1).strip())
+            if hex_color:
+                colors.append(hex_color)
+
+    return colors
 
-            for i, badge in enumerate(all_badges[:10]):  # Show first 10
-                print(f"\nBadge {i+1}:", file=sys.stderr)
-                print(f"  Classes: {badge.get('class', [])}", file=sys.stderr)
-                print(f"  Style: {badge.get('style', 'None')}", file=sys.stderr)
-                print(f"  Text: {badge.get_text(strip=True)}", file=sys.stderr)
 
-            # Also look for badge-sport specifically
-            badge_sport = soup.find_all('span', class_='badge-sport')
-            print(f"\nFound {len(badge_sport)} span elements with class 'badge-sport'", file=sys.stderr)
+def load_cache(path=CACHE_PATH):
+    """
+    Load the team color cache.
+
+    Args:
+        path: Cache file path
 
-            for i, badge in enumerate(badge_sport[:10]):
-                print(f"\nBadge-sport {i+1}:", file=sys.stderr)
-                print(f"  Classes: {badge.get('class', [])}", file=sys.stderr)
-                print(f"  Style: {badge.get('style', 'None')}", file=sys.stderr)
-                print(f"  Text: {badge.get_text(strip=True)}", file=sys.stderr)
+    Returns:
+        Dictionary of team ID string to {'colors': str, 'ts': float}
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-            print(f"\n=================\n", file=sys.stderr)
 
-        # Find all span elements with class "badge-sport"
-        badges = soup.find_all('span', class_='badge-sport')
+def save_cache(cache, path=CACHE_PATH):
+    """
+    Write the team color cache atomically.
+
+    Args:
+        cache: Dictionary as returned by load_cache()
+        path: Cache file path
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def get_cached_colors(cache, team_id):
+    """
+    Look up unexpired colors for a team in the cache.
+
+    Args:
+        cache: Dictionary as returned by load_cache()
+        team_id: The team ID number
+
+    Returns:
+        Comma-separated hex color codes, or None if not cached or expired
+    """
+    entry = cache.get(str(team_id))
+    if entry and entry.get('ts', 0) > time.time() - CACHE_MAX_AGE:
+        return entry.get('colors')
+    return None
+
+
+def fetch_team_colors(team_id, debug=False, use_browser=False, browser=None):
+    """
+    Fetch badge colors from athletic.net team page.
+
+    Args:
+        team_id: The team ID number
+        debug: If True, print diagnostic information
+        use_browser: If True, skip the plain HTTP fetch and render the page
+            in headless Chrome
+        browser: Optional BrowserSession to reuse for the browser fallback;
+            a one-off browser is started when omitted
+
+    Returns:
+        Comma-separated hex color codes (e.g., "#ffee44,#108810")
+    """
+    url = f"https://www.athletic.net/team/{team_id}"
+
+    try:
+        if debug:
+            print(f"\n=== DEBUG MODE ===", file=sys.stderr)
+            print(f"URL: {url}", file=sys.stderr)
 
         colors = []
-        for badge in badges:
-            style = badge.get('style', '')
-            if 'background-color' in style:
-                # Extract the background-color value
-                match = re.search(r'background-color:\s*([^;]+)', style)
-                if match:
-                    color_value = match.group(1).strip()
-                    hex_color = rgb_to_hex(color_value)
-                    if hex_color:
-                        colors.append(hex_color)
+        if not use_browser:
+            try:
+                page_source = fetch_page_static(url, debug)
+                colors = extract_badge_colors(page_source)
+            except (requests.exceptions.RequestException, lxml.etree.ParserError) as e:
+                if debug:
+                    print(f"Static fetch failed: {e}", file=sys.stderr)
+            else:
+                # The badge dump is only printed for the page the colors come from
+                if colors and debug:
+                    print_badge_debug(page_source)
+
+            if not colors and debug:
+                print("No badge colors in server-rendered HTML, falling back to browser...", file=sys.stderr)
+
+        if not colors:
+            if browser is not None:
+                page_source = browser.fetch(url)
+            else:
+                page_source = fetch_page_browser(url, debug)
+            colors = extract_badge_colors(page_source, debug=debug)
 
         if not colors:
             print("No badge colors found on page", file=sys.stderr)
@@ -147,27 +379,125 @@ def fetch_team_colors(team_id, debug=False):
             import traceback
             traceback.print_exc(file=sys.stderr)
         return None
-    finally:
-        if driver:
-            driver.quit()
 
 
-def main():
-    debug = '--debug' in sys.argv
-    args = [arg for arg in sys.argv[1:] if arg != '--debug']
+def read_team_ids(batch_file):
+    """
+    Read team IDs for batch mode, one per line.
 
-    if len(args) != 1:
-        print("Usage: python fetch_team_colors.py <team_id> [--debug]", file=sys.stderr)
-        sys.exit(1)
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        batch_file: Path to a file of team IDs, or '-' for stdin
+
+    Returns:
+        List of team IDs as ints
+    """
+    if batch_file == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(batch_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+    return [int(line) for line in map(str.strip, lines) if line and not line.startswith('#')]
+
+
+def lookup_team_colors(team_id, cache, force_refresh=False, debug=False, use_browser=False,
+                       browser=None):
+    """
+    Return team colors from the cache, fetching and caching them on a miss.
+
+    Args:
+        team_id: The team ID number
+        cache: Dictionary as returned by load_cache(); updated in place
+        force_refresh: If True, ignore any cached entry
+        debug: If True, print diagnostic information
+        use_browser: If True, skip the plain HTTP fetch
+        browser: Optional BrowserSession to reuse
+
+    Returns:
+        Comma-separated hex color codes, or None if none were found
+    """
+    colors = None if force_refresh else get_cached_colors(cache, team_id)
+    if colors:
+        if debug:
+            print(f"Using cached colors from {CACHE_PATH}", file=sys.stderr)
+        return colors
+
+    colors = fetch_team_colors(team_id, debug=debug, use_browser=use_browser, browser=browser)
+    if colors:
+        cache[str(team_id)] = {'colors': colors, 'ts': time.time()}
+    return colors
+
+
+def main_batch(batch_file, force_refresh=False, debug=False, use_browser=False):
+    """
+    Fetch colors for many teams, reusing one browser for all of them.
+
+    Prints one "<team_id> <colors>" line per team that has colors.
+
+    Args:
+        batch_file: Path to a file of team IDs, or '-' for stdin
+        force_refresh: If True, ignore cached entries
+        debug: If True, print diagnostic information
+        use_browser: If True, skip the plain HTTP fetch
 
+    Returns:
+        True if colors were found for every team
+    """
     try:
-        team_id = int(args[0])
-    except ValueError:
-        print("Error: team_id must be a number", file=sys.stderr)
-        sys.exit(1)
+        team_ids = read_team_ids(batch_file)
+    except (OSError, ValueError) as e:
+        print(f"Error reading team IDs: {e}", file=sys.stderr)
+        return False
+
+    cache = load_cache()
+    browser = BrowserSession(debug)
+    success = True
+    try:
+        for team_id in team_ids:
+            colors = lookup_team_colors(team_id, cache, force_refresh, debug, use_browser, browser)
+            if colors:
+                print(team_id, colors, flush=True)
+            else:
+                print(f"No colors found for team {team_id}", file=sys.stderr)
+                success = False
+    finally:
+        browser.close()
+        try:
+            save_cache(cache)
+        except OSError as e:
+            print(f"Warning: could not write cache: {e}", file=sys.stderr)
+
+    return success
+
 
-    colors = fetch_team_colors(team_id, debug=debug)
+def main():
+    parser = argparse.ArgumentParser(description='Fetch team badge colors from athletic.net')
+    parser.add_argument('team_id', nargs='?', type=int, help='Team ID number')
+    parser.add_argument('--batch-file',
+                        help="File of team IDs (one per line, '-' for stdin) fetched with one browser")
+    parser.add_argument('--use-browser', action='store_true',
+                        help='Skip the plain HTTP fetch and render pages in headless Chrome')
+    parser.add_argument('--force-refresh', action='store_true',
+                        help='Ignore cached colors and fetch again')
+    parser.add_argument('--debug', action='store_true', help='Print diagnostic information')
+    args = parser.parse_args()
+
+    if (args.team_id is None) == (args.batch_file is None):
+        parser.error("Specify exactly one of team_id or --batch-file")
+
+    if args.batch_file is not None:
+        ok = main_batch(args.batch_file, args.force_refresh, args.debug, args.use_browser)
+        sys.exit(0 if ok else 1)
+
+    cache = load_cache()
+    colors = lookup_team_colors(args.team_id, cache, args.force_refresh, args.debug, args.use_browser)
     if colors:
+        try:
+            save_cache(cache)
+        except OSError as e:
+            print(f"Warning: could not write cache: {e}", file=sys.stderr)
         print(colors)
     else:
         sys.exit(1)
@@ -2,7 +2,8 @@
 """Quick test of file_watcher module"""
 
 import logging
-import time
+import sys
+import threading
 from pathlib import Path
 
 from file_watcher import start_file_watcher
@@ -27,9 +28,14 @@ if watcher:
     print("\nTest: Modify config/current_event.json to trigger reload")
     print("Waiting for file changes... (Ctrl+C to exit)")
 
+    # Block until Ctrl+C without periodic wakeups. An untimed wait can't be
+    # interrupted on Windows, so wake once a second there.
+    stop = threading.Event()
+    wait_timeout = 1 if sys.platform == 'win32' else None
+
     try:
-        while True:
-            time.sleep(1)
+        while not stop.wait(wait_timeout):
+            pass
     except KeyboardInterrupt:
         print("\nStopping watcher...")
         watcher.stop()
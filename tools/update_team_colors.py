@@ -7,13 +7,22 @@ This script:
 2. Extracts all unique team names (affiliations)
 3. Compares them to colors.csv
 4. Adds missing teams with default values (black background, white text)
+
+If neither file has changed since the last successful run (tracked by mtime in
+config/.update_team_colors.cache), the script exits without parsing anything.
 """
 
 import csv
+import json
+import mmap
 import os
+import re
 import sys
 from pathlib import Path
 
+# Relay affiliations have 2-4 letters, spaces, then a single letter (e.g. 'ddcm  A')
+_RELAY_RE = re.compile(r'^\s*\w{2,4}\s+\w\s*$')
+
 
 def get_project_root():
     """Get the project root directory (parent of tools directory)."""
@@ -35,32 +44,30 @@ def parse_lynx_teams(lynx_path):
         print(f"Error: lynx.evt file not found at {lynx_path}")
         return teams
 
-    import re
-
-    with open(lynx_path, 'r', encoding='utf-8', errors='replace') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+    if os.path.getsize(lynx_path) == 0:
+        return teams
 
-            parts = [p.strip() for p in line.split(',')]
-            if not parts:
-                continue
+    with open(lynx_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Athlete lines start with empty first column, so only lines beginning
+        # with a comma are decoded; event header lines are skipped as raw bytes
+        athlete_lines = (raw.decode('utf-8', errors='replace')
+                         for raw in iter(mm.readline, b'')
+                         if raw.lstrip(b' \t')[:1] == b',')
 
-            # Athlete lines start with empty first column
+        for row in csv.reader(athlete_lines):
             # Format: '', athleteId, lane, last, first, affiliation, ...
-            if not parts[0] and len(parts) > 5:
-                first_name = parts[4].strip() if len(parts) > 4 else ""
-                affiliation = parts[5].strip()
+            if len(row) > 5:
+                affiliation = row[5]
 
                 # Skip relay entries (no first name and affiliation matches pattern like 'ddcm  A')
-                # Relay affiliations have 2-4 letters, spaces, then a single letter
-                if not first_name and re.match(r'^\w{2,4}\s+\w$', affiliation):
+                if not row[4].strip() and _RELAY_RE.match(affiliation):
                     continue
 
-                if affiliation:
-                    teams.add(affiliation)
+                teams.add(affiliation)
 
+    # Strip once per distinct affiliation rather than once per athlete
+    teams = {team.strip() for team in teams}
+    teams.discard('')
     return teams
 
 
@@ -79,13 +86,17 @@ def load_existing_teams(colors_path):
         print(f"Warning: colors.csv file not found at {colors_path}")
         return teams
 
-    with open(colors_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            affiliation = row.get('affiliation', '').strip()
-            if affiliation:
-                teams.add(affiliation)
+    with open(colors_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if 'affiliation' not in header:
+            return teams
+
+        idx = header.index('affiliation')
+        teams = {row[idx] for row in reader if len(row) > idx}
 
+    teams = {team.strip() for team in teams}
+    teams.discard('')
     return teams
 
 
@@ -103,13 +114,60 @@ def add_missing_teams(colors_path, missing_teams):
     # Sort teams for consistent output
     sorted_teams = sorted(missing_teams)
 
+    # Format: affiliation, name, bgcolor, text
+    # Default: black background (#000000), white text (#ffffff)
+    rows = [[team, team, '#000000', '#ffffff'] for team in sorted_teams]
+
     with open(colors_path, 'a', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        for team in sorted_teams:
-            # Format: affiliation, name, bgcolor, text
-            # Default: black background (#000000), white text (#ffffff)
-            writer.writerow([team, team, '#000000', '#ffffff'])
-            print(f"Added: {team}")
+        csv.writer(f).writerows(rows)
+
+    for team in sorted_teams:
+        print(f"Added: {team}")
+
+
+def file_mtimes(*paths):
+    """Get modification times of files.
+
+    Args:
+        paths: Files to stat
+
+    Returns:
+        List of st_mtime_ns values, or None if any file is missing
+    """
+    try:
+        return [os.stat(path).st_mtime_ns for path in paths]
+    except OSError:
+        return None
+
+
+def load_mtime_cache(cache_path):
+    """Load the mtimes recorded by the last successful run.
+
+    Args:
+        cache_path: Path to the sidecar cache file
+
+    Returns:
+        List of mtimes, or None if there is no usable cache
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_mtime_cache(cache_path, mtimes):
+    """Record file mtimes after a successful run.
+
+    Args:
+        cache_path: Path to the sidecar cache file
+        mtimes: List of mtimes from file_mtimes()
+    """
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(mtimes, f)
+    except OSError as e:
+        print(f"Warning: could not write {cache_path}: {e}")
 
 
 def main():
@@ -119,11 +177,22 @@ def main():
 
     lynx_path = config_dir / 'lynx.evt'
     colors_path = config_dir / 'colors.csv'
+    cache_path = config_dir / '.update_team_colors.cache'
+
+    # Nothing to do if neither file changed since the last successful run
+    mtimes = file_mtimes(lynx_path, colors_path)
+    if mtimes is not None and mtimes == load_mtime_cache(cache_path):
+        print("No changes to lynx.evt or colors.csv since the last run")
+        return
 
     print(f"Reading teams from: {lynx_path}")
     lynx_teams = parse_lynx_teams(lynx_path)
     print(f"Found {len(lynx_teams)} unique teams in lynx.evt")
 
+    if not lynx_teams:
+        print("\nNo teams found in lynx.evt, nothing to update")
+        return
+
     print(f"\nReading existing teams from: {colors_path}")
     existing_teams = load_existing_teams(colors_path)
     print(f"Found {len(existing_teams)} teams in colors.csv")
@@ -142,6 +211,11 @@ def main():
     else:
         print("\nAll teams from lynx.evt are already in colors.csv")
 
+    # colors.csv may have just been appended to, so stat it again
+    mtimes = file_mtimes(lynx_path, colors_path)
+    if mtimes is not None:
+        save_mtime_cache(cache_path, mtimes)
+
 
 if __name__ == '__main__':
     main()
@@ -2,8 +2,9 @@
 """
 Test script for uploading event and schedule files to LED display web server.
 
-This script reads lynx.evt and/or lynx.sch files and uploads them to the
-web server using the file upload API endpoints.
+This script uploads lynx.evt and/or lynx.sch files to the web server using
+the file upload API endpoints. Files are sent as multipart/form-data parts
+straight from disk rather than being embedded in a JSON body.
 
 Usage:
     # Upload both files separately
@@ -26,27 +27,29 @@ Usage:
         --schedule-file config/lynx.sch
 """
 
+from __future__ import annotations
+
 import argparse
+import hashlib
+import mmap
 import sys
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-try:
+# requests is imported lazily so --help and argument errors don't pay for it
+if TYPE_CHECKING:
     import requests
-except ImportError:
-    print("Error: 'requests' library not found.", file=sys.stderr)
-    print("Install it with: pip install requests", file=sys.stderr)
-    sys.exit(1)
 
 
-def read_file(file_path: str) -> str:
-    """Read file contents with UTF-8 encoding.
+def check_file(file_path: str) -> Path:
+    """Check that a file exists and can be uploaded.
 
     Args:
-        file_path: Path to file to read
+        file_path: Path to file to upload
 
     Returns:
-        File contents as string
+        Path to the file
 
     Raises:
         FileNotFoundError: If file doesn't exist
@@ -59,61 +62,138 @@ def read_file(file_path: str) -> str:
     if not path.is_file():
         raise IOError(f"Not a file: {file_path}")
 
-    with open(path, 'r', encoding='utf-8') as f:
-        return f.read()
+    return path
 
 
-def upload_events(server_url: str, events_file: str) -> bool:
-    """Upload events file to server.
+def create_session() -> requests.Session:
+    """Create an HTTP session shared by all uploads in one run.
+
+    Reusing the session keeps the connection to the server alive between
+    uploads, and transient connection errors are retried with backoff.
+
+    Returns:
+        Configured requests session
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=1,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _sha256_file(path: Path) -> str:
+    """Compute the SHA-256 hex digest of a file without reading it into memory.
 
     Args:
-        server_url: Base URL of web server (e.g., http://localhost:5000)
-        events_file: Path to lynx.evt file
+        path: File to hash
 
     Returns:
-        True if upload succeeded, False otherwise
+        Hex digest string
     """
-    try:
-        content = read_file(events_file)
-    except Exception as e:
-        print(f"✗ Error reading events file: {e}", file=sys.stderr)
-        return False
+    with open(path, 'rb') as f:
+        if path.stat().st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
 
-    url = f"{server_url.rstrip('/')}/api/upload/events"
-    data = {"content": content}
 
-    print(f"Uploading events from {events_file}...")
+def _post_files(session: requests.Session, server_url: str, endpoint: str,
+                files: Dict[str, Path]) -> Optional[Dict[str, Any]]:
+    """POST files as multipart parts and return the server's JSON result.
+
+    The files' SHA-256 digests are sent in an X-Content-Hash header so the
+    server can skip the upload (answering {'unchanged': true}) when it
+    already has identical content. Connection errors, timeouts and other non-200 responses are
+    reported on stderr.
+
+    Args:
+        session: HTTP session to send the request on
+        server_url: Base URL of web server (e.g., http://localhost:5000)
+        endpoint: API path to post to (e.g., /api/upload/events)
+        files: Mapping of multipart field name to file path
+
+    Returns:
+        Parsed JSON response on success ({'unchanged': True} if the server
+        skipped the upload), None on failure
+    """
+    import requests
+
+    url = f"{server_url.rstrip('/')}{endpoint}"
 
     try:
-        response = requests.post(url, json=data, timeout=30)
+        headers = {'X-Content-Hash': ','.join(_sha256_file(path) for path in files.values())}
+        with ExitStack() as stack:
+            parts = {name: (path.name, stack.enter_context(open(path, 'rb')))
+                     for name, path in files.items()}
+            response = session.post(url, files=parts, headers=headers, timeout=30)
     except requests.exceptions.ConnectionError:
         print(f"✗ Error: Could not connect to server at {server_url}", file=sys.stderr)
         print("  Is the server running?", file=sys.stderr)
-        return False
+        return None
     except requests.exceptions.Timeout:
         print(f"✗ Error: Request timed out after 30 seconds", file=sys.stderr)
-        return False
+        return None
     except Exception as e:
         print(f"✗ Error: {e}", file=sys.stderr)
-        return False
+        return None
 
-    if response.status_code == 200:
-        result = response.json()
-        print(f"✓ Successfully uploaded {result['event_count']} events")
-        return True
-    else:
+    if response.status_code != 200:
         try:
             error = response.json().get('error', 'Unknown error')
-        except:
+        except ValueError:
             error = response.text
         print(f"✗ Upload failed (HTTP {response.status_code}): {error}", file=sys.stderr)
+        return None
+
+    result = response.json()
+    if result.get('unchanged'):
+        print("✓ Server already has identical content, nothing to update")
+    return result
+
+
+def upload_events(session: requests.Session, server_url: str, events_file: str) -> bool:
+    """Upload events file to server.
+
+    Args:
+        session: HTTP session to send the request on
+        server_url: Base URL of web server (e.g., http://localhost:5000)
+        events_file: Path to lynx.evt file
+
+    Returns:
+        True if upload succeeded, False otherwise
+    """
+    try:
+        path = check_file(events_file)
+    except Exception as e:
+        print(f"✗ Error reading events file: {e}", file=sys.stderr)
         return False
 
+    print(f"Uploading events from {events_file}...")
+
+    result = _post_files(session, server_url, '/api/upload/events', {'content': path})
+    if result is None:
+        return False
+    if result.get('unchanged'):
+        return True
 
-def upload_schedule(server_url: str, schedule_file: str) -> bool:
+    print(f"✓ Successfully uploaded {result['event_count']} events")
+    return True
+
+
+def upload_schedule(session: requests.Session, server_url: str, schedule_file: str) -> bool:
     """Upload schedule file to server.
 
     Args:
+        session: HTTP session to send the request on
         server_url: Base URL of web server (e.g., http://localhost:5000)
         schedule_file: Path to lynx.sch file
 
@@ -121,50 +201,33 @@ def upload_schedule(server_url: str, schedule_file: str) -> bool:
         True if upload succeeded, False otherwise
     """
     try:
-        content = read_file(schedule_file)
+        path = check_file(schedule_file)
     except Exception as e:
         print(f"✗ Error reading schedule file: {e}", file=sys.stderr)
         return False
 
-    url = f"{server_url.rstrip('/')}/api/upload/schedule"
-    data = {"content": content}
-
     print(f"Uploading schedule from {schedule_file}...")
 
-    try:
-        response = requests.post(url, json=data, timeout=30)
-    except requests.exceptions.ConnectionError:
-        print(f"✗ Error: Could not connect to server at {server_url}", file=sys.stderr)
-        print("  Is the server running?", file=sys.stderr)
-        return False
-    except requests.exceptions.Timeout:
-        print(f"✗ Error: Request timed out after 30 seconds", file=sys.stderr)
-        return False
-    except Exception as e:
-        print(f"✗ Error: {e}", file=sys.stderr)
+    result = _post_files(session, server_url, '/api/upload/schedule', {'content': path})
+    if result is None:
         return False
+    if result.get('unchanged'):
+        return True
 
-    if response.status_code == 200:
-        result = response.json()
-        print(f"✓ Successfully uploaded schedule: {result['valid_entries']}/{result['total_entries']} valid entries")
+    print(f"✓ Successfully uploaded schedule: {result['valid_entries']}/{result['total_entries']} valid entries")
 
-        if result['invalid_entries'] > 0:
-            print(f"  ⚠ Warning: {result['invalid_entries']} entries don't match existing events")
+    if result['invalid_entries'] > 0:
+        print(f"  ⚠ Warning: {result['invalid_entries']} entries don't match existing events")
 
-        return True
-    else:
-        try:
-            error = response.json().get('error', 'Unknown error')
-        except:
-            error = response.text
-        print(f"✗ Upload failed (HTTP {response.status_code}): {error}", file=sys.stderr)
-        return False
+    return True
 
 
-def upload_combined(server_url: str, events_file: str, schedule_file: str) -> bool:
+def upload_combined(session: requests.Session, server_url: str, events_file: str,
+                    schedule_file: str) -> bool:
     """Upload both files atomically to server.
 
     Args:
+        session: HTTP session to send the request on
         server_url: Base URL of web server (e.g., http://localhost:5000)
         events_file: Path to lynx.evt file
         schedule_file: Path to lynx.sch file
@@ -173,57 +236,36 @@ def upload_combined(server_url: str, events_file: str, schedule_file: str) -> bo
         True if upload succeeded, False otherwise
     """
     try:
-        events_content = read_file(events_file)
+        events_path = check_file(events_file)
     except Exception as e:
         print(f"✗ Error reading events file: {e}", file=sys.stderr)
         return False
 
     try:
-        schedule_content = read_file(schedule_file)
+        schedule_path = check_file(schedule_file)
     except Exception as e:
         print(f"✗ Error reading schedule file: {e}", file=sys.stderr)
         return False
 
-    url = f"{server_url.rstrip('/')}/api/upload/combined"
-    data = {
-        "events": events_content,
-        "schedule": schedule_content
-    }
-
     print(f"Uploading both files atomically...")
     print(f"  Events:   {events_file}")
     print(f"  Schedule: {schedule_file}")
 
-    try:
-        response = requests.post(url, json=data, timeout=30)
-    except requests.exceptions.ConnectionError:
-        print(f"✗ Error: Could not connect to server at {server_url}", file=sys.stderr)
-        print("  Is the server running?", file=sys.stderr)
-        return False
-    except requests.exceptions.Timeout:
-        print(f"✗ Error: Request timed out after 30 seconds", file=sys.stderr)
-        return False
-    except Exception as e:
-        print(f"✗ Error: {e}", file=sys.stderr)
+    files = {'events': events_path, 'schedule': schedule_path}
+    result = _post_files(session, server_url, '/api/upload/combined', files)
+    if result is None:
         return False
+    if result.get('unchanged'):
+        return True
 
-    if response.status_code == 200:
-        result = response.json()
-        print(f"✓ Successfully uploaded both files:")
-        print(f"  Events:   {result['events']['event_count']} events")
-        print(f"  Schedule: {result['schedule']['valid_entries']}/{result['schedule']['total_entries']} valid entries")
+    print(f"✓ Successfully uploaded both files:")
+    print(f"  Events:   {result['events']['event_count']} events")
+    print(f"  Schedule: {result['schedule']['valid_entries']}/{result['schedule']['total_entries']} valid entries")
 
-        if result['schedule']['invalid_entries'] > 0:
-            print(f"  ⚠ Warning: {result['schedule']['invalid_entries']} schedule entries don't match events")
+    if result['schedule']['invalid_entries'] > 0:
+        print(f"  ⚠ Warning: {result['schedule']['invalid_entries']} schedule entries don't match events")
 
-        return True
-    else:
-        try:
-            error = response.json().get('error', 'Unknown error')
-        except:
-            error = response.text
-        print(f"✗ Upload failed (HTTP {response.status_code}): {error}", file=sys.stderr)
-        return False
+    return True
 
 
 def main():
@@ -286,21 +328,31 @@ Examples:
         if not args.events_file or not args.schedule_file:
             parser.error("--combined requires both --events-file and --schedule-file")
 
-    # Execute uploads
+    try:
+        import requests  # noqa: F401
+    except ImportError:
+        print("Error: 'requests' library not found.", file=sys.stderr)
+        print("Install it with: pip install requests", file=sys.stderr)
+        sys.exit(1)
+
+    # Execute uploads over one keep-alive session
     success = True
 
-    if args.combined:
-        # Atomic upload of both files
-        success = upload_combined(args.server_url, args.events_file, args.schedule_file)
-    else:
-        # Upload files separately
-        if args.events_file:
-            if not upload_events(args.server_url, args.events_file):
-                success = False
-
-        if args.schedule_file:
-            if not upload_schedule(args.server_url, args.schedule_file):
-                success = False
+    with create_session() as session:
+        if args.combined:
+            # Atomic upload of both files
+            success = upload_combined(session, args.server_url, args.events_file, args.schedule_file)
+        else:
+            # Upload files separately. These stay sequential: the server validates
+            # the schedule against the current lynx.evt, so the events upload must
+            # land first or the schedule would be checked against stale events.
+            if args.events_file:
+                if not upload_events(session, args.server_url, args.events_file):
+                    success = False
+
+            if args.schedule_file:
+                if not upload_schedule(session, args.server_url, args.schedule_file):
+                    success = False
 
     # Exit with appropriate status
     if success:
@@ -7,22 +7,189 @@ Provides a Flask-based web interface for:
 - Adjusting display settings in settings.toml
 """
 
+import copy
 import csv
+import gzip
+import hashlib
+import io
 import json
 import logging
 import os
 import re
 import shutil
 import threading
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import toml
 from flask import Flask, jsonify, render_template, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.serving import make_server
 
 from event_parser import (load_affiliation_colors, parse_hex_color,
-                          parse_lynx_file)
-from schedule_parser import parse_schedule, validate_schedule_entries
+                          parse_lynx_file, parse_lynx_text)
+from schedule_parser import parse_schedule_text, validate_schedule_entries
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import tomli_w
+    TOMLI_W_AVAILABLE = True
+except ImportError:
+    TOMLI_W_AVAILABLE = False
+
+try:
+    from waitress import create_server
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+    logger.warning("waitress not available. Web server will use Flask's development server.")
+
+# /api/events bodies smaller than this aren't worth gzipping
+GZIP_MIN_SIZE = 1024
+
+# Worker for file writes that can overlap a write on the request thread
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='web-io')
+
+# One lock per config file, so concurrent saves of the same file don't share
+# its temp file or replace it out from under each other
+_file_locks: Dict[Path, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+# HTML pages served from memory by the page routes
+STATIC_PAGES = ('index.html', 'teams.html', 'display.html')
+
+# colors.csv columns, in file order
+TEAM_FIELDS = ('affiliation', 'name', 'bgcolor', 'text')
+_TEAM_FIELD_SET = frozenset(TEAM_FIELDS)
+
+# Characters that make csv.writer quote a field
+_CSV_QUOTE_RE = re.compile(r'[,"\r\n]')
+
+# Fast check for the common '#rrggbb' form; anything else goes through parse_hex_color
+_HEX_RE = re.compile(r'#?[0-9A-Fa-f]{6}')
+
+# Numeric [display] settings: name, type, and the phrases used in error messages.
+# Every one of them must be greater than zero.
+_DISPLAY_SPEC = (
+    ('line_height', int, 'an integer', 'a positive integer'),
+    ('header_line_height', int, 'an integer', 'a positive integer'),
+    ('header_rows', int, 'an integer', 'a positive integer'),
+    ('font_shift', int, 'an integer', 'a positive integer'),
+    ('interval', float, 'a number', 'a positive number'),
+)
+
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """Serialize an object as compact JSON bytes without a str round trip."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _dumps_indented(obj: Any) -> bytes:
+    """Serialize an object as 2-space indented JSON bytes for config files."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def _dumps_toml(config: Dict[str, Any]) -> bytes:
+    """Serialize settings as TOML bytes, preferring tomli_w over toml.
+
+    toml is only imported when tomli_w is missing, so the server runs without
+    either installed; saving settings then fails with an ImportError.
+    """
+    if TOMLI_W_AVAILABLE:
+        return tomli_w.dumps(config).encode('utf-8')
+    import toml
+    return toml.dumps(config).encode('utf-8')
+
+
+def _quote_csv_field(field: str) -> str:
+    """Quote a CSV field the way csv.writer's QUOTE_MINIMAL does."""
+    if _CSV_QUOTE_RE.search(field):
+        return '"' + field.replace('"', '""') + '"'
+    return field
+
+
+def _file_lock(path: Path) -> threading.Lock:
+    """Get the lock that serializes writes to a config file."""
+    with _file_locks_guard:
+        return _file_locks.setdefault(path, threading.Lock())
+
+
+def _contains_null(value: Any) -> bool:
+    """Check whether a JSON value is or contains a null, which TOML can't represent."""
+    if value is None:
+        return True
+    if isinstance(value, dict):
+        return any(_contains_null(v) for v in value.values())
+    if isinstance(value, list):
+        return any(_contains_null(v) for v in value)
+    return False
+
+
+def _encode_csv(header: Tuple[str, ...], rows: List[Tuple]) -> bytes:
+    """Format rows as CSV bytes, identical to csv.writer's output.
+
+    String rows are joined straight into one buffer, quoting only the fields
+    that need it; rows holding other types fall back to csv.writer.
+
+    Args:
+        header: Column names
+        rows: Row tuples
+
+    Returns:
+        UTF-8 encoded CSV with CRLF line endings
+    """
+    if all(type(field) is str for row in rows for field in row):
+        out = bytearray()
+        for row in (header, *rows):
+            out += ','.join(map(_quote_csv_field, row)).encode('utf-8')
+            out += b'\r\n'
+        return bytes(out)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson.
+
+    Used for jsonify() responses and request.get_json() when orjson is
+    installed; Flask's stdlib-based provider is kept otherwise. Non-string
+    dictionary keys are converted to strings, as the stdlib encoder does,
+    and keys are sorted whenever sort_keys is set, as in Flask's provider.
+    """
+
+    def _options(self, sort_keys: bool) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = self._options(kwargs.get('sort_keys', self.sort_keys))
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options(self.sort_keys))
+        return self._app.response_class(body, mimetype=self.mimetype)
 
 
 class WebServer:
@@ -37,12 +204,40 @@ class WebServer:
             port: Port to listen on
         """
         self.config_dir = Path(config_dir)
+
+        # Config files, resolved once rather than on every request
+        self._lynx_file = self.config_dir / "lynx.evt"
+        self._schedule_file = self.config_dir / "lynx.sch"
+        self._lynx_temp = self.config_dir / "lynx.evt.tmp"
+        self._schedule_temp = self.config_dir / "lynx.sch.tmp"
+        self._colors_file = self.config_dir / "colors.csv"
+        self._current_event_file = self.config_dir / "current_event.json"
+        self._settings_file = self.config_dir / "settings.toml"
         self.host = host
         self.port = port
         self.app = Flask(__name__,
                         static_folder='static',
                         template_folder='templates')
+        if ORJSON_AVAILABLE:
+            self.app.json = OrjsonProvider(self.app)
         self.server_thread = None
+        self.wsgi_server = None
+
+        # Serialized /api/events body and its gzipped form (None when too small
+        # to be worth compressing), keyed on lynx.evt/lynx.sch stat data
+        self._events_cache: Optional[Tuple[Tuple, bytes, Optional[bytes]]] = None
+        self._events_lock = threading.Lock()
+
+        # Serialized /api/teams body, keyed on colors.csv stat data
+        self._teams_cache: Optional[Tuple[Tuple[int, int], bytes]] = None
+
+        # Parsed settings.toml, keyed on its stat data. The lock serializes
+        # read-modify-write saves so concurrent requests can't drop an update.
+        self._settings_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+        self._settings_lock = threading.Lock()
+
+        # Static pages only change on deploy, so they are read once up front
+        self._static_cache: Dict[str, Tuple[bytes, bytes, str]] = self._load_static_pages()
 
         # Register routes
         self._register_routes()
@@ -52,65 +247,117 @@ class WebServer:
         log.setLevel(logging.WARNING)
 
     def _register_routes(self):
-        """Register all Flask routes."""
+        """Register all Flask routes.
+
+        Handlers are registered directly as bound methods, so requests don't
+        go through an extra wrapper function.
+        """
+        add = self.app.add_url_rule
 
         # Static pages
-        @self.app.route('/')
-        def index():
-            return send_from_directory('static', 'index.html')
+        add('/', 'index', self._static_page, defaults={'name': 'index.html'})
+        add('/teams', 'teams', self._static_page, defaults={'name': 'teams.html'})
+        add('/display', 'display', self._static_page, defaults={'name': 'display.html'})
 
-        @self.app.route('/teams')
-        def teams():
-            return send_from_directory('static', 'teams.html')
+        # API endpoints
+        add('/api/events', 'get_events', self._get_events, methods=['GET'])
+        add('/api/current_event', 'get_current_event', self._get_current_event, methods=['GET'])
+        add('/api/current_event', 'set_current_event', self._set_current_event, methods=['POST'])
+        add('/api/teams', 'get_teams', self._get_teams, methods=['GET'])
+        add('/api/teams', 'set_teams', self._set_teams, methods=['POST'])
+        add('/api/display_settings', 'get_display_settings', self._get_display_settings, methods=['GET'])
+        add('/api/display_settings', 'set_display_settings', self._set_display_settings, methods=['POST'])
+        add('/api/teams/add_missing', 'add_missing_teams', self._add_missing_teams, methods=['POST'])
+        add('/api/upload/events', 'upload_events', self._upload_events, methods=['POST'])
+        add('/api/upload/schedule', 'upload_schedule', self._upload_schedule, methods=['POST'])
+        add('/api/upload/combined', 'upload_combined', self._upload_combined, methods=['POST'])
+
+    def _load_static_pages(self) -> Dict[str, Tuple[bytes, bytes, str]]:
+        """Read the static HTML pages, gzip them and compute their ETags.
 
-        @self.app.route('/display')
-        def display():
-            return send_from_directory('static', 'display.html')
+        Returns:
+            Dictionary mapping page filename to (content, gzipped content, etag);
+            pages that can't be read are left out and served from disk instead
+        """
+        pages = {}
+        static_dir = Path(self.app.static_folder)
+        for name in STATIC_PAGES:
+            try:
+                content = (static_dir / name).read_bytes()
+            except OSError as e:
+                logger.warning("Could not cache static page %s: %s", name, e)
+                continue
+            pages[name] = (content, gzip.compress(content, mtime=0),
+                           hashlib.blake2b(content).hexdigest()[:16])
+        return pages
 
-        # API endpoints
-        @self.app.route('/api/events', methods=['GET'])
-        def get_events():
-            return self._get_events()
+    def _static_page(self, name: str):
+        """Serve a cached static HTML page, answering 304 if the ETag matches.
 
-        @self.app.route('/api/current_event', methods=['GET'])
-        def get_current_event():
-            return self._get_current_event()
+        Args:
+            name: Page filename in the static folder
 
-        @self.app.route('/api/current_event', methods=['POST'])
-        def set_current_event():
-            return self._set_current_event()
+        Returns:
+            Flask response
+        """
+        cached = self._static_cache.get(name)
+        if cached is None:
+            return send_from_directory('static', name)
 
-        @self.app.route('/api/teams', methods=['GET'])
-        def get_teams():
-            return self._get_teams()
+        content, gzipped, etag = cached
+        return self._conditional(self._encoded_response(content, gzipped, 'text/html'), etag)
 
-        @self.app.route('/api/teams', methods=['POST'])
-        def set_teams():
-            return self._set_teams()
+    @staticmethod
+    def _conditional(response, etag: str):
+        """Tag a response with its ETag, turning it into a 304 if the client has it.
 
-        @self.app.route('/api/display_settings', methods=['GET'])
-        def get_display_settings():
-            return self._get_display_settings()
+        Clients must revalidate before reusing a cached copy, so changes show
+        up immediately while unchanged data costs only an empty 304.
 
-        @self.app.route('/api/display_settings', methods=['POST'])
-        def set_display_settings():
-            return self._set_display_settings()
+        Args:
+            response: Response to send
+            etag: ETag of the uncompressed representation
 
-        @self.app.route('/api/teams/add_missing', methods=['POST'])
-        def add_missing_teams():
-            return self._add_missing_teams()
+        Returns:
+            The same response, possibly changed to 304 Not Modified
+        """
+        # Each encoding is a different representation, so it needs its own ETag
+        response.set_etag(etag + '-gzip' if response.content_encoding == 'gzip' else etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    @staticmethod
+    def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+        """Get a cheap change-detection key for a file.
+
+        Args:
+            path: File to stat
+
+        Returns:
+            (mtime in ns, size) tuple, or None if the file doesn't exist
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
 
-        @self.app.route('/api/upload/events', methods=['POST'])
-        def upload_events():
-            return self._upload_events()
+    @staticmethod
+    def _stat_etag(*keys: Optional[Tuple[int, int]]) -> str:
+        """Build an ETag from _stat_key() results.
 
-        @self.app.route('/api/upload/schedule', methods=['POST'])
-        def upload_schedule():
-            return self._upload_schedule()
+        Args:
+            keys: Stat keys of the files a response is built from
 
-        @self.app.route('/api/upload/combined', methods=['POST'])
-        def upload_combined():
-            return self._upload_combined()
+        Returns:
+            ETag value that changes whenever any of the files change
+        """
+        return '-'.join(f'{key[0]:x}.{key[1]:x}' if key else '0' for key in keys)
+
+    def _invalidate_events_cache(self):
+        """Drop the cached /api/events response after lynx.evt/lynx.sch change."""
+        with self._events_lock:
+            self._events_cache = None
 
     def _get_events(self) -> Tuple[Dict, int]:
         """Get list of events from lynx.evt file.
@@ -119,72 +366,119 @@ class WebServer:
             JSON response with events list and status code
         """
         try:
-            lynx_file = self.config_dir / "lynx.evt"
-            events = parse_lynx_file(str(lynx_file))
+            lynx_file = self._lynx_file
+            schedule_path = self._schedule_file
+
+            # Serve the cached response while neither file has changed
+            cache_key = (self._stat_key(lynx_file), self._stat_key(schedule_path))
+            if cache_key[0] is None:
+                raise FileNotFoundError(f"lynx file not found: {lynx_file}")
+            with self._events_lock:
+                cached = self._events_cache
+            if cached is not None and cached[0] == cache_key:
+                response = self._conditional(self._encoded_response(cached[1], cached[2]),
+                                             self._stat_etag(*cache_key))
+                return response, response.status_code
+
+            # The stat above already established which files exist, so they
+            # are read directly rather than through the path-checking parsers
+            events = parse_lynx_text(lynx_file.read_text(encoding='utf-8', errors='replace'))
 
             # Try to load schedule for ordering
-            schedule_path = self.config_dir / "lynx.sch"
             schedule = []
-            if schedule_path.exists():
+            if cache_key[1] is not None:
                 try:
-                    raw_schedule = parse_schedule(schedule_path)
+                    raw_schedule = parse_schedule_text(schedule_path.read_text(encoding='utf-8'))
                     schedule = validate_schedule_entries(raw_schedule, events)
                 except Exception as e:
-                    logging.warning(f"Failed to load schedule for web API: {e}")
-
-            # Convert to list format for JSON
-            events_list = []
-            scheduled_keys = set()
-
-            if schedule:
-                # Add scheduled events in order with position numbers
-                for idx, (event_num, round_num, heat_num) in enumerate(schedule):
-                    key = (event_num, round_num, heat_num)
-                    scheduled_keys.add(key)
-                    event_data = events[key]
-                    events_list.append({
-                        'event': event_num,
-                        'round': round_num,
-                        'heat': heat_num,
-                        'name': event_data['name'],
-                        'athlete_count': len(event_data['athletes']),
-                        'schedule_position': idx + 1,
-                        'total_scheduled': len(schedule)
-                    })
-
-                # Add unscheduled events at the end (sorted)
-                for (event_num, round_num, heat_num), event_data in sorted(events.items()):
-                    key = (event_num, round_num, heat_num)
-                    if key not in scheduled_keys:
-                        events_list.append({
-                            'event': event_num,
-                            'round': round_num,
-                            'heat': heat_num,
-                            'name': event_data['name'],
-                            'athlete_count': len(event_data['athletes']),
-                            'schedule_position': None,
-                            'total_scheduled': None
-                        })
-            else:
-                # No schedule - use default sorting
-                for (event_num, round_num, heat_num), event_data in sorted(events.items()):
-                    events_list.append({
-                        'event': event_num,
-                        'round': round_num,
-                        'heat': heat_num,
-                        'name': event_data['name'],
-                        'athlete_count': len(event_data['athletes']),
-                        'schedule_position': None,
-                        'total_scheduled': None
-                    })
-
-            return jsonify({'events': events_list, 'has_schedule': len(schedule) > 0}), 200
+                    logger.warning("Failed to load schedule for web API: %s", e)
+
+            # One encoder call over the whole list is several times faster
+            # with orjson than encoding each entry separately and joining
+            body = _dumps_bytes({
+                'events': list(self._iter_event_entries(events, schedule)),
+                'has_schedule': bool(schedule)
+            })
+
+            # Compress once per change rather than on every request
+            gzipped = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+            with self._events_lock:
+                self._events_cache = (cache_key, body, gzipped)
+            response = self._conditional(self._encoded_response(body, gzipped),
+                                         self._stat_etag(*cache_key))
+            return response, response.status_code
         except FileNotFoundError:
             return jsonify({'error': 'lynx.evt file not found'}), 404
         except Exception as e:
-            logging.error(f"Error loading events: {e}")
+            logger.error("Error loading events: %s", e)
             return jsonify({'error': str(e)}), 500
 
+    def _encoded_response(self, body: bytes, gzipped: Optional[bytes],
+                          mimetype: str = 'application/json'):
+        """Build a response, sending the gzipped body if the client accepts it.
+
+        Args:
+            body: Uncompressed response body
+            gzipped: gzip-compressed body, or None to always send it uncompressed
+            mimetype: Response content type
+
+        Returns:
+            Flask response
+        """
+        if gzipped is None:
+            return self.app.response_class(body, mimetype=mimetype)
+
+        if request.accept_encodings['gzip'] > 0:
+            response = self.app.response_class(gzipped, mimetype=mimetype)
+            response.content_encoding = 'gzip'
+        else:
+            response = self.app.response_class(body, mimetype=mimetype)
+        response.vary.add('Accept-Encoding')
+        return response
+
+    @staticmethod
+    def _iter_event_entries(events: Dict[Tuple[int, int, int], Dict],
+                            schedule: List[Tuple[int, int, int]]) -> Iterator[Dict[str, Any]]:
+        """Yield /api/events entries: scheduled heats first, then the rest.
+
+        Args:
+            events: Parsed lynx.evt events keyed by (event, round, heat)
+            schedule: Validated schedule entries in running order
+
+        Yields:
+            One dictionary per heat
+        """
+        total_scheduled = len(schedule)
+
+        # Scheduled events in order with position numbers
+        for idx, key in enumerate(schedule):
+            event_num, round_num, heat_num = key
+            event_data = events[key]
+            yield {
+                'event': event_num,
+                'round': round_num,
+                'heat': heat_num,
+                'name': event_data['name'],
+                'athlete_count': len(event_data['athletes']),
+                'schedule_position': idx + 1,
+                'total_scheduled': total_scheduled
+            }
+
+        # Unscheduled events at the end (sorted); with no schedule this is
+        # every event in default order. Only the unscheduled keys are sorted.
+        for key in sorted(events.keys() - set(schedule)):
+            event_num, round_num, heat_num = key
+            event_data = events[key]
+            yield {
+                'event': event_num,
+                'round': round_num,
+                'heat': heat_num,
+                'name': event_data['name'],
+                'athlete_count': len(event_data['athletes']),
+                'schedule_position': None,
+                'total_scheduled': None
+            }
+
     def _get_current_event(self) -> Tuple[Dict, int]:
         """Get current event selection from current_event.json.
 
@@ -192,16 +486,15 @@ class WebServer:
             JSON response with current event and status code
         """
         try:
-            current_event_file = self.config_dir / "current_event.json"
-            with open(current_event_file, 'r', encoding='utf-8') as f:
-                current_event = json.load(f)
+            current_event_file = self._current_event_file
+            current_event = self.app.json.loads(current_event_file.read_bytes())
             return jsonify(current_event), 200
         except FileNotFoundError:
             return jsonify({'error': 'current_event.json file not found'}), 404
         except json.JSONDecodeError as e:
             return jsonify({'error': f'Invalid JSON format: {e}'}), 400
         except Exception as e:
-            logging.error(f"Error loading current event: {e}")
+            logger.error("Error loading current event: %s", e)
             return jsonify({'error': str(e)}), 500
 
     def _set_current_event(self) -> Tuple[Dict, int]:
@@ -213,7 +506,9 @@ class WebServer:
             JSON response with success/error and status code
         """
         try:
-            data = request.get_json()
+            data = self._json_body()
+            if data is None:
+                return jsonify({'error': 'Invalid JSON body'}), 400
 
             # Validate required fields
             if not all(k in data for k in ['event', 'round', 'heat']):
@@ -231,21 +526,20 @@ class WebServer:
                 return jsonify({'error': 'Event, round, and heat must be integers'}), 400
 
             # Write to file
-            current_event_file = self.config_dir / "current_event.json"
+            current_event_file = self._current_event_file
             current_event = {
                 'event': event_num,
                 'round': round_num,
                 'heat': heat_num
             }
 
-            with open(current_event_file, 'w', encoding='utf-8') as f:
-                json.dump(current_event, f, indent=2)
-
-            logging.info(f"Updated current event to: Event={event_num}, Round={round_num}, Heat={heat_num}")
+            if self._replace_file(current_event_file, _dumps_indented(current_event)):
+                logger.info("Updated current event to: Event=%s, Round=%s, Heat=%s",
+                            event_num, round_num, heat_num)
             return jsonify({'success': True, 'current_event': current_event}), 200
 
         except Exception as e:
-            logging.error(f"Error setting current event: {e}")
+            logger.error("Error setting current event: %s", e)
             return jsonify({'error': str(e)}), 500
 
     def _get_teams(self) -> Tuple[Dict, int]:
@@ -255,26 +549,53 @@ class WebServer:
             JSON response with teams list and status code
         """
         try:
-            colors_file = self.config_dir / "colors.csv"
-            teams = []
-
-            with open(colors_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    teams.append({
-                        'affiliation': row.get('affiliation', ''),
-                        'name': row.get('name', ''),
-                        'bgcolor': row.get('bgcolor', ''),
-                        'text': row.get('text', '')
-                    })
-
-            return jsonify({'teams': teams}), 200
+            colors_file = self._colors_file
+
+            # Serve the cached response while colors.csv is unchanged
+            cache_key = self._stat_key(colors_file)
+            if cache_key is None:
+                raise FileNotFoundError(f"colors file not found: {colors_file}")
+            cached = self._teams_cache
+            if cached is not None and cached[0] == cache_key:
+                body = cached[1]
+            else:
+                # Serialize each team as it is read instead of collecting a list first
+                with open(colors_file, 'r', encoding='utf-8', newline='') as f:
+                    entries = b','.join(map(_dumps_bytes, self._iter_teams(csv.reader(f))))
+
+                body = b'{"teams":[' + entries + b']}'
+                self._teams_cache = (cache_key, body)
+
+            response = self._conditional(self.app.response_class(body, mimetype='application/json'),
+                                         self._stat_etag(cache_key))
+            return response, response.status_code
         except FileNotFoundError:
             return jsonify({'error': 'colors.csv file not found'}), 404
         except Exception as e:
-            logging.error(f"Error loading teams: {e}")
+            logger.error("Error loading teams: %s", e)
             return jsonify({'error': str(e)}), 500
 
+    @staticmethod
+    def _iter_teams(reader: Iterator[List[str]]) -> Iterator[Dict[str, str]]:
+        """Yield /api/teams entries from colors.csv rows.
+
+        Args:
+            reader: csv.reader over colors.csv, positioned at the header row
+
+        Yields:
+            One dictionary per team; missing columns are empty strings
+        """
+        header = next(reader, [])
+        columns = {name: i for i, name in enumerate(header)}
+        indices = [(field, columns.get(field)) for field in TEAM_FIELDS]
+
+        for row in reader:
+            if not row:
+                continue
+            count = len(row)
+            yield {field: row[i] if i is not None and i < count else ''
+                   for field, i in indices}
+
     def _set_teams(self) -> Tuple[Dict, int]:
         """Set team color mappings in colors.csv.
 
@@ -284,7 +605,9 @@ class WebServer:
             JSON response with success/error and status code
         """
         try:
-            data = request.get_json()
+            data = self._json_body()
+            if data is None:
+                return jsonify({'error': 'Invalid JSON body'}), 400
 
             if 'teams' not in data or not isinstance(data['teams'], list):
                 return jsonify({'error': 'Missing or invalid teams array'}), 400
@@ -294,7 +617,7 @@ class WebServer:
             # Validate each team
             for i, team in enumerate(teams):
                 # Check required fields
-                if not all(k in team for k in ['affiliation', 'name', 'bgcolor', 'text']):
+                if not isinstance(team, dict) or not _TEAM_FIELD_SET <= team.keys():
                     return jsonify({'error': f'Team {i}: Missing required fields'}), 400
 
                 # Validate affiliation is not empty
@@ -302,24 +625,25 @@ class WebServer:
                     return jsonify({'error': f'Team {i}: Affiliation cannot be empty'}), 400
 
                 # Validate color formats
-                for color_field in ['bgcolor', 'text']:
+                for color_field in ('bgcolor', 'text'):
+                    color = team[color_field]
                     try:
-                        parse_hex_color(team[color_field])
+                        if not _HEX_RE.fullmatch(color):
+                            parse_hex_color(color)
                     except ValueError as e:
                         return jsonify({'error': f'Team {i} ({team["affiliation"]}): Invalid {color_field}: {e}'}), 400
 
             # Write to CSV file
-            colors_file = self.config_dir / "colors.csv"
-            with open(colors_file, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=['affiliation', 'name', 'bgcolor', 'text'])
-                writer.writeheader()
-                writer.writerows(teams)
-
-            logging.info(f"Updated team colors: {len(teams)} teams saved")
+            colors_file = self._colors_file
+            rows = [(team['affiliation'], team['name'], team['bgcolor'], team['text'])
+                    for team in teams]
+            if self._replace_file(colors_file, _encode_csv(TEAM_FIELDS, rows)):
+                self._teams_cache = None
+                logger.info("Updated team colors: %d teams saved", len(teams))
             return jsonify({'success': True, 'count': len(teams)}), 200
 
         except Exception as e:
-            logging.error(f"Error setting teams: {e}")
+            logger.error("Error setting teams: %s", e)
             return jsonify({'error': str(e)}), 500
 
     def _add_missing_teams(self) -> Tuple[Dict, int]:
@@ -332,18 +656,16 @@ class WebServer:
             JSON response with count of teams added and status code
         """
         try:
-            lynx_file = self.config_dir / "lynx.evt"
-            colors_file = self.config_dir / "colors.csv"
-
-            # Check if lynx.evt exists
-            if not lynx_file.exists():
-                return jsonify({'error': 'lynx.evt file not found. Please upload an events file first.'}), 404
+            lynx_file = self._lynx_file
+            colors_file = self._colors_file
 
-            # Parse lynx.evt to get all events
+            # Parse lynx.evt to get all events; opening it doubles as the existence check
             try:
-                events = parse_lynx_file(str(lynx_file))
+                events = parse_lynx_text(lynx_file.read_text(encoding='utf-8', errors='replace'))
+            except FileNotFoundError:
+                return jsonify({'error': 'lynx.evt file not found. Please upload an events file first.'}), 404
             except Exception as e:
-                logging.error(f"Error parsing lynx.evt: {e}")
+                logger.error("Error parsing lynx.evt: %s", e)
                 return jsonify({'error': f'Error parsing lynx.evt: {str(e)}'}), 500
 
             # Extract unique affiliations from events, filtering out relay entries
@@ -365,13 +687,18 @@ class WebServer:
 
             # Load existing teams from colors.csv
             existing_teams = set()
-            if colors_file.exists():
-                with open(colors_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        affiliation = row.get('affiliation', '').strip()
-                        if affiliation:
-                            existing_teams.add(affiliation)
+            try:
+                with open(colors_file, 'r', encoding='utf-8', newline='') as f:
+                    # Only one column is needed, so rows are indexed directly
+                    # rather than turned into dicts
+                    reader = csv.reader(f)
+                    header = next(reader, [])
+                    if 'affiliation' in header:
+                        idx = header.index('affiliation')
+                        existing_teams = {row[idx].strip() for row in reader if len(row) > idx}
+                        existing_teams.discard('')
+            except FileNotFoundError:
+                pass
 
             # Find missing teams
             missing_teams = lynx_teams - existing_teams
@@ -381,14 +708,16 @@ class WebServer:
 
             # Append missing teams to colors.csv with default colors
             sorted_missing = sorted(missing_teams)
-            with open(colors_file, 'a', encoding='utf-8', newline='') as f:
+            # Hold the colors.csv lock so a concurrent team save can't replace it mid-append
+            with _file_lock(colors_file), open(colors_file, 'a', encoding='utf-8', newline='') as f:
                 writer = csv.writer(f)
                 for team in sorted_missing:
                     # Format: affiliation, name, bgcolor, text
                     # Default: black background (#000000), white text (#ffffff)
                     writer.writerow([team, team, '#000000', '#ffffff'])
+            self._teams_cache = None
 
-            logging.info(f"Added {len(missing_teams)} missing teams to colors.csv")
+            logger.info("Added %d missing teams to colors.csv", len(missing_teams))
             return jsonify({
                 'success': True,
                 'added_count': len(missing_teams),
@@ -396,9 +725,52 @@ class WebServer:
             }), 200
 
         except Exception as e:
-            logging.error(f"Error adding missing teams: {e}")
+            logger.error("Error adding missing teams: %s", e)
             return jsonify({'error': str(e)}), 500
 
+    def _load_settings(self, settings_file: Path) -> Tuple[Tuple[int, int], Dict[str, Any]]:
+        """Load settings.toml, reusing the last parse while the file is unchanged.
+
+        The returned dictionary is shared with the cache and must not be modified.
+
+        Args:
+            settings_file: Path to settings.toml
+
+        Returns:
+            Tuple of (stat key the parse belongs to, parsed settings)
+
+        Raises:
+            FileNotFoundError: If settings.toml doesn't exist
+        """
+        key = self._stat_key(settings_file)
+        if key is None:
+            raise FileNotFoundError(f"settings file not found: {settings_file}")
+
+        cached = self._settings_cache
+        if cached is not None and cached[0] == key:
+            return cached
+
+        config = tomllib.loads(settings_file.read_text(encoding='utf-8'))
+        self._settings_cache = (key, config)
+        return key, config
+
+    @staticmethod
+    def _display_view(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the display settings returned by the API.
+
+        Args:
+            config: Parsed settings.toml
+
+        Returns:
+            Copy of the [display] section plus [fonts] font_name
+        """
+        display_settings = dict(config.get('display', {}))
+        fonts_settings = config.get('fonts', {})
+        # Include font_name (editable) but not font_path (toml-only)
+        if 'font_name' in fonts_settings:
+            display_settings['font_name'] = fonts_settings['font_name']
+        return display_settings
+
     def _get_display_settings(self) -> Tuple[Dict, int]:
         """Get display settings from settings.toml.
 
@@ -406,20 +778,14 @@ class WebServer:
             JSON response with display settings and status code
         """
         try:
-            settings_file = self.config_dir / "settings.toml"
-            with open(settings_file, 'r', encoding='utf-8') as f:
-                config = toml.load(f)
-
-            display_settings = config.get('display', {})
-            fonts_settings = config.get('fonts', {})
-            # Include font_name (editable) but not font_path (toml-only)
-            if 'font_name' in fonts_settings:
-                display_settings['font_name'] = fonts_settings['font_name']
-            return jsonify({'display': display_settings}), 200
+            key, config = self._load_settings(self._settings_file)
+            response = self._conditional(jsonify({'display': self._display_view(config)}),
+                                         self._stat_etag(key))
+            return response, response.status_code
         except FileNotFoundError:
             return jsonify({'error': 'settings.toml file not found'}), 404
         except Exception as e:
-            logging.error(f"Error loading display settings: {e}")
+            logger.error("Error loading display settings: %s", e)
             return jsonify({'error': str(e)}), 500
 
     def _set_display_settings(self) -> Tuple[Dict, int]:
@@ -432,7 +798,9 @@ class WebServer:
             JSON response with success/error and status code
         """
         try:
-            data = request.get_json()
+            data = self._json_body()
+            if data is None:
+                return jsonify({'error': 'Invalid JSON body'}), 400
 
             if 'display' not in data or not isinstance(data['display'], dict):
                 return jsonify({'error': 'Missing or invalid display settings object'}), 400
@@ -443,28 +811,10 @@ class WebServer:
             font_name = new_display.pop('font_name', None)
 
             # Validate display settings
-            int_fields = ['line_height', 'header_line_height', 'header_rows', 'font_shift']
-            float_fields = ['interval']
-
-            for field in int_fields:
-                if field in new_display:
-                    try:
-                        value = int(new_display[field])
-                        if value <= 0:
-                            return jsonify({'error': f'{field} must be a positive integer'}), 400
-                        new_display[field] = value
-                    except (ValueError, TypeError):
-                        return jsonify({'error': f'{field} must be an integer'}), 400
-
-            for field in float_fields:
-                if field in new_display:
-                    try:
-                        value = float(new_display[field])
-                        if value <= 0:
-                            return jsonify({'error': f'{field} must be a positive number'}), 400
-                        new_display[field] = value
-                    except (ValueError, TypeError):
-                        return jsonify({'error': f'{field} must be a number'}), 400
+            try:
+                self._validate_display(new_display)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
 
             # Validate font_name if present
             if font_name is not None:
@@ -474,51 +824,252 @@ class WebServer:
                 if not font_name.endswith('.bdf'):
                     return jsonify({'error': 'font_name must be a .bdf font file'}), 400
 
-            # Load current settings
-            settings_file = self.config_dir / "settings.toml"
-            with open(settings_file, 'r', encoding='utf-8') as f:
-                config = toml.load(f)
+            settings_file = self._settings_file
+            with self._settings_lock:
+                _, current = self._load_settings(settings_file)
 
-            # Update display section
-            if 'display' not in config:
-                config['display'] = {}
-            config['display'].update(new_display)
+                # Nothing to write if every submitted value matches the current settings
+                current_display = current.get('display', {})
+                if (all(k in current_display and current_display[k] == v
+                        for k, v in new_display.items())
+                        and (font_name is None
+                             or current.get('fonts', {}).get('font_name') == font_name)):
+                    return jsonify({'success': True, 'display': self._display_view(current)}), 200
 
-            # Update font_name in fonts section if provided
-            if font_name is not None:
-                if 'fonts' not in config:
-                    config['fonts'] = {}
-                config['fonts']['font_name'] = font_name
-                logging.info(f"Updated font_name: {font_name}")
+                # Update a copy of the cached parse rather than reading the file again
+                config = copy.deepcopy(current)
+
+                # Update display section
+                if 'display' not in config:
+                    config['display'] = {}
+                config['display'].update(new_display)
 
-            # Write back to file
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                toml.dump(config, f)
+                # Update font_name in fonts section if provided
+                if font_name is not None:
+                    if 'fonts' not in config:
+                        config['fonts'] = {}
+                    config['fonts']['font_name'] = font_name
+                    logger.info("Updated font_name: %s", font_name)
 
-            # Prepare response
-            response_display = config['display'].copy()
-            if 'fonts' in config and 'font_name' in config['fonts']:
-                response_display['font_name'] = config['fonts']['font_name']
+                # Write back to file; what was written is the new cached parse
+                if self._replace_file(settings_file, _dumps_toml(config)):
+                    self._settings_cache = (self._stat_key(settings_file), config)
 
-            logging.info(f"Updated display settings: {new_display}")
-            return jsonify({'success': True, 'display': response_display}), 200
+            logger.info("Updated display settings: %s", new_display)
+            return jsonify({'success': True, 'display': self._display_view(config)}), 200
 
         except FileNotFoundError:
             return jsonify({'error': 'settings.toml file not found'}), 404
         except Exception as e:
-            logging.error(f"Error setting display settings: {e}")
+            logger.error("Error setting display settings: %s", e)
             return jsonify({'error': str(e)}), 500
 
+    @staticmethod
+    def _validate_display(new_display: Dict[str, Any]):
+        """Convert numeric display settings in place, checking they are positive.
+
+        Null values are rejected for every field, since they can't be written to TOML.
+
+        Args:
+            new_display: Submitted [display] values
+
+        Raises:
+            ValueError: With a client-facing message for the first invalid value
+        """
+        for field, cast, type_name, positive_name in _DISPLAY_SPEC:
+            if field not in new_display:
+                continue
+            try:
+                value = cast(new_display[field])
+            except (ValueError, TypeError):
+                raise ValueError(f'{field} must be {type_name}') from None
+            if value <= 0:
+                raise ValueError(f'{field} must be {positive_name}')
+            new_display[field] = value
+
+        for field, value in new_display.items():
+            if _contains_null(value):
+                raise ValueError(f'{field} must not be null')
+
+    def _json_body(self) -> Optional[Dict[str, Any]]:
+        """Parse the request body as a JSON object.
+
+        Unlike request.get_json(), the raw body isn't kept cached on the
+        request once it has been parsed.
+
+        Returns:
+            Parsed JSON object, an empty dict for an empty body (so handlers
+            report their usual missing-field 400), or None if the body isn't
+            a valid JSON object
+        """
+        body = request.get_data(cache=False)
+        if not body:
+            return {}
+        try:
+            data = self.app.json.loads(body)
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _upload_fields(self, *names: str) -> Optional[Dict[str, Any]]:
+        """Read upload fields from a multipart form, a text body or a JSON body.
+
+        Multipart requests carry each field as a file part, which lets clients
+        stream the file instead of embedding it in a JSON string. Single-field
+        uploads may also send the file itself as a text/plain body.
+
+        Args:
+            names: Field names to read from the multipart file parts
+
+        Returns:
+            Dictionary of field name to content, or None for an invalid JSON body
+
+        Raises:
+            UnicodeDecodeError: If a file part or text body isn't valid UTF-8
+        """
+        if request.files:
+            return {name: request.files[name].read().decode('utf-8')
+                    for name in names if name in request.files}
+        if len(names) == 1 and request.mimetype == 'text/plain':
+            return {names[0]: request.get_data(cache=False).decode('utf-8')}
+        return self._json_body()
+
+    def _content_unchanged(self, *paths: Path) -> bool:
+        """Check the request's X-Content-Hash header against files on disk.
+
+        The header holds comma-separated SHA-256 hex digests, one per file in
+        the given order. A match means the upload would not change anything.
+
+        Args:
+            paths: Config files the upload would replace
+
+        Returns:
+            True if every digest matches the current file contents
+        """
+        header = request.headers.get('X-Content-Hash')
+        if not header:
+            return False
+
+        digests = []
+        for path in paths:
+            try:
+                digests.append(hashlib.sha256(path.read_bytes()).hexdigest())
+            except OSError:
+                return False
+
+        return [h.strip().lower() for h in header.split(',')] == digests
+
+    def _events_newer_than(self, path: Path) -> bool:
+        """Check whether lynx.evt was replaced after a file validated against it.
+
+        Args:
+            path: Config file whose contents were checked against lynx.evt
+
+        Returns:
+            True if lynx.evt is newer than path, or either file is missing
+        """
+        events_key = self._stat_key(self._lynx_file)
+        file_key = self._stat_key(path)
+        return events_key is None or file_key is None or events_key[0] > file_key[0]
+
+    @staticmethod
+    def _write_synced(path: Path, content: str):
+        """Write an upload to a temp file and flush it to disk.
+
+        The fsync makes the following rename crash-safe: after a power loss
+        the config file holds either the old or the new content, never a
+        truncated one.
+
+        Args:
+            path: Temp file to write
+            content: Text to write
+        """
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _replace_file(path: Path, data: bytes) -> bool:
+        """Atomically replace a config file, skipping the write if nothing changed.
+
+        Clients often re-submit the current values, so comparing first saves
+        a disk write (and a display reload) per request. Changes go through a
+        synced temp file and os.replace(), like uploads.
+
+        Args:
+            path: Config file to replace
+            data: New file contents
+
+        Returns:
+            True if the file was written, False if it already held data
+        """
+        with _file_lock(path):
+            try:
+                if path.read_bytes() == data:
+                    return False
+            except FileNotFoundError:
+                pass
+
+            temp_file = path.with_name(path.name + '.tmp')
+            try:
+                with open(temp_file, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, path)
+            except BaseException:
+                temp_file.unlink(missing_ok=True)
+                raise
+        return True
+
+    def _backup_file(self, path: Path):
+        """Keep a config file as <name>.bak before it is replaced.
+
+        The backup is a hard link, so no data is copied: the following
+        os.replace() points the config file at a new inode and the backup
+        keeps the old one. Filesystems without hard links get a copy.
+
+        Args:
+            path: File about to be overwritten; nothing happens if it doesn't exist
+        """
+        backup_file = path.with_name(path.name + '.bak')
+        try:
+            try:
+                os.link(path, backup_file)
+            except FileExistsError:
+                # Only drop the old backup once there is a file to replace it with
+                backup_file.unlink()
+                os.link(path, backup_file)
+        except FileNotFoundError:
+            return
+        except OSError:
+            try:
+                shutil.copy2(path, backup_file)
+            except FileNotFoundError:
+                return
+        logger.info("Created backup: %s", backup_file)
+
     def _upload_events(self) -> Tuple[Dict, int]:
         """Upload and replace lynx.evt file.
 
-        Expects JSON body with 'content' field containing CSV text.
+        Expects a 'content' field containing CSV text, either in a JSON body
+        or as a multipart file part. Answers {'unchanged': true} without
+        touching the file if X-Content-Hash matches the current lynx.evt.
 
         Returns:
             JSON response with success/error and status code
         """
         try:
-            data = request.get_json()
+            if self._content_unchanged(self._lynx_file):
+                return jsonify({'success': True, 'unchanged': True}), 200
+
+            try:
+                data = self._upload_fields('content')
+            except UnicodeDecodeError:
+                return jsonify({'error': 'Upload must be UTF-8 text'}), 400
+            if data is None:
+                return jsonify({'error': 'Invalid JSON body'}), 400
 
             if 'content' not in data or not isinstance(data['content'], str):
                 return jsonify({'error': 'Missing or invalid content field (must be string)'}), 400
@@ -528,55 +1079,62 @@ class WebServer:
             if not content.strip():
                 return jsonify({'error': 'Content cannot be empty'}), 400
 
-            # Validate content by attempting to parse it
-            events_file = self.config_dir / "lynx.evt"
-
-            # Create a temporary file to test parsing
-            temp_file = self.config_dir / "lynx.evt.tmp"
+            # Validate content by parsing it straight from memory
             try:
-                with open(temp_file, 'w', encoding='utf-8', newline='') as f:
-                    f.write(content)
+                events = parse_lynx_text(content)
+                if not events:
+                    return jsonify({'error': 'No valid events found in content'}), 400
+            except Exception as e:
+                return jsonify({'error': f'Invalid lynx.evt format: {e}'}), 400
 
-                # Test parse the file
-                try:
-                    events = parse_lynx_file(str(temp_file))
-                    if not events:
-                        return jsonify({'error': 'No valid events found in content'}), 400
-                except Exception as e:
-                    return jsonify({'error': f'Invalid lynx.evt format: {e}'}), 400
+            events_file = self._lynx_file
+            temp_file = self._lynx_temp
+            try:
+                self._write_synced(temp_file, content)
 
                 # Parsing succeeded - create backup of existing file
-                if events_file.exists():
-                    backup_file = self.config_dir / "lynx.evt.bak"
-                    shutil.copy2(events_file, backup_file)
-                    logging.info(f"Created backup: {backup_file}")
+                self._backup_file(events_file)
 
-                # Move temp file to actual file
-                shutil.move(str(temp_file), str(events_file))
+                # Atomically rename temp file over the actual file
+                os.replace(temp_file, events_file)
+                self._invalidate_events_cache()
 
-                logging.info(f"Updated lynx.evt: {len(events)} events")
+                logger.info("Updated lynx.evt: %d events", len(events))
                 return jsonify({'success': True, 'event_count': len(events)}), 200
 
             finally:
                 # Clean up temp file if it still exists
-                if temp_file.exists():
-                    temp_file.unlink()
+                temp_file.unlink(missing_ok=True)
 
         except Exception as e:
-            logging.error(f"Error uploading events: {e}")
+            logger.error("Error uploading events: %s", e)
             return jsonify({'error': str(e)}), 500
 
     def _upload_schedule(self) -> Tuple[Dict, int]:
         """Upload and replace lynx.sch file.
 
-        Expects JSON body with 'content' field containing CSV text.
-        Validates schedule entries against existing events in lynx.evt.
+        Expects a 'content' field containing CSV text, either in a JSON body
+        or as a multipart file part. Validates schedule entries against
+        existing events in lynx.evt. Answers {'unchanged': true} without
+        touching the file if X-Content-Hash matches the current lynx.sch and
+        lynx.evt hasn't been replaced since lynx.sch was written.
 
         Returns:
             JSON response with success/error and status code
         """
         try:
-            data = request.get_json()
+            # The stored schedule was validated against the lynx.evt of its
+            # time, so a newer lynx.evt means validating it again
+            if (self._content_unchanged(self._schedule_file)
+                    and not self._events_newer_than(self._schedule_file)):
+                return jsonify({'success': True, 'unchanged': True}), 200
+
+            try:
+                data = self._upload_fields('content')
+            except UnicodeDecodeError:
+                return jsonify({'error': 'Upload must be UTF-8 text'}), 400
+            if data is None:
+                return jsonify({'error': 'Invalid JSON body'}), 400
 
             if 'content' not in data or not isinstance(data['content'], str):
                 return jsonify({'error': 'Missing or invalid content field (must be string)'}), 400
@@ -587,46 +1145,41 @@ class WebServer:
                 return jsonify({'error': 'Content cannot be empty'}), 400
 
             # Load existing events for validation
-            events_file = self.config_dir / "lynx.evt"
+            events_file = self._lynx_file
             try:
                 events = parse_lynx_file(str(events_file))
             except Exception as e:
                 return jsonify({'error': f'Cannot validate schedule: failed to load lynx.evt: {e}'}), 500
 
-            # Create a temporary file to test parsing
-            schedule_file = self.config_dir / "lynx.sch"
-            temp_file = self.config_dir / "lynx.sch.tmp"
-
+            # Validate content by parsing it straight from memory
             try:
-                with open(temp_file, 'w', encoding='utf-8', newline='') as f:
-                    f.write(content)
+                schedule = parse_schedule_text(content)
+                if not schedule:
+                    return jsonify({'error': 'No valid schedule entries found in content'}), 400
+            except Exception as e:
+                return jsonify({'error': f'Invalid lynx.sch format: {e}'}), 400
 
-                # Test parse the file
-                try:
-                    schedule = parse_schedule(str(temp_file))
-                    if not schedule:
-                        return jsonify({'error': 'No valid schedule entries found in content'}), 400
-                except Exception as e:
-                    return jsonify({'error': f'Invalid lynx.sch format: {e}'}), 400
+            # Validate schedule entries exist in events
+            valid_schedule = validate_schedule_entries(schedule, events)
+            invalid_count = len(schedule) - len(valid_schedule)
 
-                # Validate schedule entries exist in events
-                valid_schedule = validate_schedule_entries(schedule, events)
-                invalid_count = len(schedule) - len(valid_schedule)
+            if invalid_count > 0:
+                logger.warning("Schedule contains %d entries not found in lynx.evt", invalid_count)
 
-                if invalid_count > 0:
-                    logging.warning(f"Schedule contains {invalid_count} entries not found in lynx.evt")
+            if not valid_schedule:
+                return jsonify({'error': 'No valid schedule entries (none match existing events)'}), 400
 
-                if not valid_schedule:
-                    return jsonify({'error': 'No valid schedule entries (none match existing events)'}), 400
+            schedule_file = self._schedule_file
+            temp_file = self._schedule_temp
+            try:
+                self._write_synced(temp_file, content)
 
                 # Validation succeeded - create backup of existing file
-                if schedule_file.exists():
-                    backup_file = self.config_dir / "lynx.sch.bak"
-                    shutil.copy2(schedule_file, backup_file)
-                    logging.info(f"Created backup: {backup_file}")
+                self._backup_file(schedule_file)
 
-                # Move temp file to actual file
-                shutil.move(str(temp_file), str(schedule_file))
+                # Atomically rename temp file over the actual file
+                os.replace(temp_file, schedule_file)
+                self._invalidate_events_cache()
 
                 result = {
                     'success': True,
@@ -635,30 +1188,39 @@ class WebServer:
                     'invalid_entries': invalid_count
                 }
 
-                logging.info(f"Updated lynx.sch: {len(valid_schedule)}/{len(schedule)} valid entries")
+                logger.info("Updated lynx.sch: %d/%d valid entries", len(valid_schedule), len(schedule))
                 return jsonify(result), 200
 
             finally:
                 # Clean up temp file if it still exists
-                if temp_file.exists():
-                    temp_file.unlink()
+                temp_file.unlink(missing_ok=True)
 
         except Exception as e:
-            logging.error(f"Error uploading schedule: {e}")
+            logger.error("Error uploading schedule: %s", e)
             return jsonify({'error': str(e)}), 500
 
     def _upload_combined(self) -> Tuple[Dict, int]:
         """Upload and replace both lynx.evt and lynx.sch files atomically.
 
-        Expects JSON body with 'events' and 'schedule' fields containing CSV text.
-        Both files are validated before either is written. If validation fails,
-        neither file is updated.
+        Expects 'events' and 'schedule' fields containing CSV text, either in
+        a JSON body or as multipart file parts. Both files are validated before
+        either is written. If validation fails, neither file is updated.
+        Answers {'unchanged': true} without touching either file if
+        X-Content-Hash matches the current lynx.evt and lynx.sch.
 
         Returns:
             JSON response with success/error and status code
         """
         try:
-            data = request.get_json()
+            if self._content_unchanged(self._lynx_file, self._schedule_file):
+                return jsonify({'success': True, 'unchanged': True}), 200
+
+            try:
+                data = self._upload_fields('events', 'schedule')
+            except UnicodeDecodeError:
+                return jsonify({'error': 'Upload must be UTF-8 text'}), 400
+            if data is None:
+                return jsonify({'error': 'Invalid JSON body'}), 400
 
             # Validate required fields
             if 'events' not in data or not isinstance(data['events'], str):
@@ -676,59 +1238,53 @@ class WebServer:
             if not schedule_content.strip():
                 return jsonify({'error': 'Schedule content cannot be empty'}), 400
 
-            events_file = self.config_dir / "lynx.evt"
-            schedule_file = self.config_dir / "lynx.sch"
-            events_temp = self.config_dir / "lynx.evt.tmp"
-            schedule_temp = self.config_dir / "lynx.sch.tmp"
+            # Parse and validate events content
+            try:
+                events = parse_lynx_text(events_content)
+                if not events:
+                    return jsonify({'error': 'No valid events found in events content'}), 400
+            except Exception as e:
+                return jsonify({'error': f'Invalid lynx.evt format: {e}'}), 400
 
+            # Parse and validate schedule content
             try:
-                # Write both temp files
-                with open(events_temp, 'w', encoding='utf-8', newline='') as f:
-                    f.write(events_content)
+                schedule = parse_schedule_text(schedule_content)
+                if not schedule:
+                    return jsonify({'error': 'No valid schedule entries found in schedule content'}), 400
+            except Exception as e:
+                return jsonify({'error': f'Invalid lynx.sch format: {e}'}), 400
 
-                with open(schedule_temp, 'w', encoding='utf-8', newline='') as f:
-                    f.write(schedule_content)
+            # Validate schedule entries exist in events
+            valid_schedule = validate_schedule_entries(schedule, events)
+            invalid_count = len(schedule) - len(valid_schedule)
 
-                # Parse and validate events file
-                try:
-                    events = parse_lynx_file(str(events_temp))
-                    if not events:
-                        return jsonify({'error': 'No valid events found in events content'}), 400
-                except Exception as e:
-                    return jsonify({'error': f'Invalid lynx.evt format: {e}'}), 400
+            if invalid_count > 0:
+                logger.warning("Schedule contains %d entries not found in events", invalid_count)
 
-                # Parse and validate schedule file
-                try:
-                    schedule = parse_schedule(str(schedule_temp))
-                    if not schedule:
-                        return jsonify({'error': 'No valid schedule entries found in schedule content'}), 400
-                except Exception as e:
-                    return jsonify({'error': f'Invalid lynx.sch format: {e}'}), 400
-
-                # Validate schedule entries exist in events
-                valid_schedule = validate_schedule_entries(schedule, events)
-                invalid_count = len(schedule) - len(valid_schedule)
+            if not valid_schedule:
+                return jsonify({'error': 'No valid schedule entries (none match events in lynx.evt)'}), 400
 
-                if invalid_count > 0:
-                    logging.warning(f"Schedule contains {invalid_count} entries not found in events")
+            events_file = self._lynx_file
+            schedule_file = self._schedule_file
+            events_temp = self._lynx_temp
+            schedule_temp = self._schedule_temp
 
-                if not valid_schedule:
-                    return jsonify({'error': 'No valid schedule entries (none match events in lynx.evt)'}), 400
+            try:
+                # Write both temp files, overlapping the two fsync waits
+                schedule_write = _io_pool.submit(self._write_synced, schedule_temp, schedule_content)
+                try:
+                    self._write_synced(events_temp, events_content)
+                finally:
+                    schedule_write.result()
 
                 # Both files validated - create backups
-                if events_file.exists():
-                    backup_file = self.config_dir / "lynx.evt.bak"
-                    shutil.copy2(events_file, backup_file)
-                    logging.info(f"Created backup: {backup_file}")
+                self._backup_file(events_file)
+                self._backup_file(schedule_file)
 
-                if schedule_file.exists():
-                    backup_file = self.config_dir / "lynx.sch.bak"
-                    shutil.copy2(schedule_file, backup_file)
-                    logging.info(f"Created backup: {backup_file}")
-
-                # Move temp files to actual files
-                shutil.move(str(events_temp), str(events_file))
-                shutil.move(str(schedule_temp), str(schedule_file))
+                # Atomically rename temp files over the actual files
+                os.replace(events_temp, events_file)
+                os.replace(schedule_temp, schedule_file)
+                self._invalidate_events_cache()
 
                 result = {
                     'success': True,
@@ -742,37 +1298,69 @@ class WebServer:
                     }
                 }
 
-                logging.info(f"Updated both files: {len(events)} events, {len(valid_schedule)}/{len(schedule)} valid schedule entries")
+                logger.info("Updated both files: %d events, %d/%d valid schedule entries",
+                            len(events), len(valid_schedule), len(schedule))
                 return jsonify(result), 200
 
             finally:
                 # Clean up temp files if they still exist
-                if events_temp.exists():
-                    events_temp.unlink()
-                if schedule_temp.exists():
-                    schedule_temp.unlink()
+                events_temp.unlink(missing_ok=True)
+                schedule_temp.unlink(missing_ok=True)
 
         except Exception as e:
-            logging.error(f"Error uploading combined files: {e}")
+            logger.error("Error uploading combined files: %s", e)
             return jsonify({'error': str(e)}), 500
 
     def start(self):
-        """Start the web server in a background thread."""
+        """Start the web server in a background thread.
+
+        Serves with waitress when it is installed, falling back to Werkzeug's
+        development server otherwise. Both handle concurrent requests on
+        separate threads, so a slow disk read doesn't block other clients,
+        and both can be shut down with stop().
+        """
         if self.server_thread is not None and self.server_thread.is_alive():
-            logging.warning("Web server already running")
+            logger.warning("Web server already running")
             return
 
-        def run_server():
-            logging.info(f"Starting web server on http://{self.host}:{self.port}")
-            self.app.run(host=self.host, port=self.port, debug=False, use_reloader=False)
+        if WAITRESS_AVAILABLE:
+            # Bind now so port errors surface here rather than in the thread
+            self.wsgi_server = create_server(self.app, host=self.host, port=self.port, threads=4)
+
+            def run_server():
+                logger.info("Starting web server (waitress) on http://%s:%s", self.host, self.port)
+                self.wsgi_server.run()
+        else:
+            # The same server app.run() uses, created directly so stop() can shut it down
+            self.wsgi_server = make_server(self.host, self.port, self.app, threaded=True)
+
+            def run_server():
+                logger.info("Starting web server on http://%s:%s", self.host, self.port)
+                self.wsgi_server.serve_forever()
 
         self.server_thread = threading.Thread(target=run_server, daemon=True)
         self.server_thread.start()
-        logging.info(f"Web interface available at http://{self.host}:{self.port}")
+        logger.info("Web interface available at http://%s:%s", self.host, self.port)
 
     def stop(self):
-        """Stop the web server (not fully implemented - Flask doesn't support graceful shutdown easily)."""
-        logging.info("Web server stopping (note: Flask server will continue until main process exits)")
+        """Stop the web server.
+
+        Requests already being handled are allowed to finish; no new
+        connections are accepted.
+        """
+        server, self.wsgi_server = self.wsgi_server, None
+        if server is None:
+            return
+
+        if WAITRESS_AVAILABLE:
+            # Close from inside waitress's event loop so its select() never
+            # sees the listening socket disappear underneath it
+            server.trigger.pull_trigger(server.close)
+        else:
+            # Waits for serve_forever() to return, then releases the socket
+            server.shutdown()
+            server.server_close()
+        logger.info("Web server stopped")
 
 
 def start_web_server(config_dir: str, host: str = "0.0.0.0", port: int = 5000) -> Optional[WebServer]:
@@ -791,5 +1379,5 @@ def start_web_server(config_dir: str, host: str = "0.0.0.0", port: int = 5000) -
         server.start()
         return server
     except Exception as e:
-        logging.error(f"Failed to start web server: {e}")
+        logger.error("Failed to start web server: %s", e)
         return None